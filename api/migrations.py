@@ -0,0 +1,178 @@
+import argparse
+import os
+import re
+from pathlib import Path
+
+import psycopg
+from dotenv import load_dotenv
+
+# Schema changes the API depends on, applied in order and recorded in schema_migrations.
+# Each one is (version, description, [statements]); statements run in autocommit so index
+# builds can be CONCURRENTLY (no write lock on tables the crawler is filling).
+# Never edit a migration that has shipped -- add a new one.
+MIGRATIONS = [
+    # the tables the crawler / MU extractor fill and the API reads; IF NOT EXISTS so databases that
+    # predate this file (tables made by hand / by the services' ensure_* helpers) pick it up as-is
+    ("0000_base_tables", "resources, mu_* and etl_state tables", [
+        """CREATE TABLE IF NOT EXISTS resources (
+             id            serial PRIMARY KEY,
+             job_id        text,
+             job_name      text,
+             resource_type text,
+             abs_path      text UNIQUE,
+             filename      text,
+             created_at    timestamp
+           )""",
+        """CREATE TABLE IF NOT EXISTS etl_state (
+             process      text PRIMARY KEY,
+             etl_version  int     NOT NULL,
+             last_mtime   bigint  NOT NULL,
+             last_path    text    NOT NULL,
+             updated_at   timestamptz NOT NULL DEFAULT now()
+           )""",
+        """CREATE TABLE IF NOT EXISTS mu_locations (
+             uid        text PRIMARY KEY,
+             job_name   text,
+             filepath   text,
+             updated_at timestamptz NOT NULL DEFAULT now(),
+             size_bytes bigint,
+             file_mtime bigint
+           )""",
+        """CREATE TABLE IF NOT EXISTS mu_jobs (
+             uid      text PRIMARY KEY,
+             job_id   text,
+             job_name text
+           )""",
+        """CREATE TABLE IF NOT EXISTS mu_dimensions (
+             uid       text PRIMARY KEY,
+             width_mm  int,
+             height_mm int,
+             depth_mm  int
+           )""",
+        """CREATE TABLE IF NOT EXISTS mu_boards (
+             uid          text,
+             xb_type      text,
+             thickness_mm text,
+             size_text    text,
+             units_up     numeric
+           )""",
+    ]),
+    ("0001_pg_trgm", "trigram extension for fuzzy search", [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    ]),
+    ("0002_trgm_indexes", "trigram GIN indexes for name / filename / board search", [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_job_name_trgm ON resources USING gin (job_name gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_filename_trgm ON resources USING gin (filename gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS mu_boards_xb_type_trgm ON mu_boards USING gin (xb_type gin_trgm_ops)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS mu_boards_size_text_trgm ON mu_boards USING gin (size_text gin_trgm_ops)",
+    ]),
+    # btree indexes matched to what the endpoints filter / sort on (see PLAN_CHECKS)
+    ("0003_endpoint_indexes", "indexes for /search and /material_usage filters and sort", [
+        # /search default order + LIMIT: read in index order; id is the keyset pagination tiebreaker,
+        # so a page is one range scan from the cursor
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_sort_idx ON resources (job_name, resource_type, filename, id)",
+        # /search?job_id=[&types=], /material_usage's resources.job_id = mu_jobs.job_id join
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_job_id_type_idx ON resources (job_id, resource_type)",
+        # /search?types=[&year=] (year is a created_at range)
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_type_created_idx ON resources (resource_type, created_at)",
+        # /search?year= alone
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS resources_created_at_idx ON resources (created_at)",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS mu_jobs_job_id_idx ON mu_jobs (job_id)",
+        # join key of /material_usage and the extractor's delete-and-replace of a sheet's boards
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS mu_boards_uid_idx ON mu_boards (uid)",
+    ]),
+]
+
+# allowed to fail (e.g. a managed database role without CREATE EXTENSION): logged and left
+# unrecorded, so a later run retries them, and the migrations after them still apply
+OPTIONAL = {"0001_pg_trgm", "0002_trgm_indexes"}
+
+LOCK_ID = 0x78616e69  # pg_advisory_lock key: one migrator at a time (app instances + CLI)
+_CONCURRENT_INDEX = re.compile(r"(?i)CREATE\s+(?:UNIQUE\s+)?INDEX\s+CONCURRENTLY\s+IF\s+NOT\s+EXISTS\s+(\w+)")
+
+
+def ensure_ledger(cur):
+    cur.execute("""
+      CREATE TABLE IF NOT EXISTS schema_migrations (
+        version      text PRIMARY KEY,
+        description  text NOT NULL,
+        applied_at   timestamptz NOT NULL DEFAULT now()
+      )
+    """)
+
+
+def applied(cur) -> set:
+    cur.execute("SELECT version FROM schema_migrations")
+    return {r[0] for r in cur.fetchall()}
+
+
+def _drop_invalid_index(cur, name: str):
+    # an interrupted CREATE INDEX CONCURRENTLY leaves an INVALID index behind, which IF NOT EXISTS
+    # would then happily skip
+    cur.execute("""
+      SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+      WHERE c.relname = %s AND NOT i.indisvalid AND pg_catalog.pg_table_is_visible(c.oid)
+    """, (name,))
+    if cur.fetchone():
+        print(f"migrations: dropping invalid index {name} (interrupted build)")
+        cur.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def migrate(dsn, dry_run=False) -> list:
+    """Apply the pending migrations; returns the versions applied (or that would be)."""
+    with psycopg.connect(dsn, autocommit=True) as conn, conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_lock(%s)", (LOCK_ID,))
+        try:
+            ensure_ledger(cur)
+            done = applied(cur)
+            pending = [m for m in MIGRATIONS if m[0] not in done]
+            versions = []
+            for version, description, statements in pending:
+                print(f"migrations: {'would apply' if dry_run else 'applying'} {version} ({description})")
+                if dry_run:
+                    versions.append(version)
+                    continue
+                try:
+                    for sql in statements:
+                        m = _CONCURRENT_INDEX.match(sql)
+                        if m:
+                            _drop_invalid_index(cur, m.group(1))
+                        cur.execute(sql)
+                except psycopg.Error as e:
+                    if version not in OPTIONAL:
+                        raise
+                    print(f"migrations: skipped optional {version}: {e}")
+                    continue
+                cur.execute("INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                            (version, description))
+                versions.append(version)
+            return versions
+        finally:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (LOCK_ID,))
+
+
+def main(argv=None):
+    load_dotenv(dotenv_path=Path(__file__).with_name(".env"))
+    load_dotenv(dotenv_path=Path(__file__).with_name(".env.development"), override=False)
+    ap = argparse.ArgumentParser(description="Apply the API's database migrations.")
+    ap.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="default DATABASE_URL")
+    ap.add_argument("--list", action="store_true", help="show which migrations are applied and exit")
+    ap.add_argument("--dry-run", action="store_true", help="show what would be applied")
+    args = ap.parse_args(argv)
+    if not args.dsn:
+        raise RuntimeError("Set DATABASE_URL in api/.env.development or your host env")
+
+    if args.list:
+        with psycopg.connect(args.dsn, autocommit=True) as conn, conn.cursor() as cur:
+            ensure_ledger(cur)
+            done = applied(cur)
+        for version, description, _ in MIGRATIONS:
+            print(f"{'x' if version in done else ' '} {version}  {description}")
+        return
+    versions = migrate(args.dsn, dry_run=args.dry_run)
+    if not versions:
+        print("migrations: up to date")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import argparse
+import sys
+
+import psycopg
+
+from . import app as api
+from .migrations import migrate
+
+# EXPLAIN the queries the endpoints build (same builders, representative filters) and fail when
+# one of them would read a big table with a sequential scan, i.e. no index serves that filter /
+# sort shape. Run after changing a query or the migrations:
+#   python -m api.plan_check            (exit 1 on a seq scan)
+# By default seq scans are priced out (enable_seqscan=off), so the check means "an index that
+# fits exists" and works on a small dev database too; --real keeps the planner's own costs,
+# for a database with production-sized tables. api/tests/test_plan_check.py runs the same check
+# under pytest (skipped when no database is configured).
+CHECKED_TABLES = {"resources", "mu_jobs", "mu_boards"}
+
+# (label, builder, kwargs, needs pg_trgm)
+PLAN_CHECKS = [
+    ("/search (no filter)", api.search_query, {}, False),
+    ("/search?cursor=", api.search_query, {"after": ["Job1001-Client", "mu_sheet", "Job1001 MU.xlsx", 42]}, False),
+    ("/search?types=&cursor=", api.search_query,
+     {"types": ["pics"], "after": ["Job1001-Client", "pics", "IMG_0001.jpg", 42]}, False),
+    ("/search?id=", api.search_query, {"id": 1}, False),
+    ("/search?job_id=", api.search_query, {"job_id": "1001"}, False),
+    ("/search?job_id=&types=", api.search_query, {"job_id": "1001", "types": ["mu_sheet"]}, False),
+    ("/search?types=", api.search_query, {"types": ["cut_file", "pics"]}, False),
+    ("/search?year=", api.search_query, {"year": 2024}, False),
+    ("/search?types=&year=", api.search_query, {"types": ["mu_sheet"], "year": 2024}, False),
+    ("/search?name=", api.search_query, {"name": "gondola"}, True),
+    ("/search?filename=", api.search_query, {"filename": "assembly"}, True),
+    ("/material_usage?job_id=", api.material_usage_query, {"job_id": "1001"}, False),
+    ("/material_usage?cursor=", api.material_usage_query, {"after": ["1001", 42]}, False),
+    ("/material_usage?name=", api.material_usage_query, {"name": "gondola"}, True),
+    ("/material_usage?xb_type=", api.material_usage_query, {"xb_type": "white"}, True),
+]
+
+
+def seq_scans(plan: dict) -> list:
+    # relation names of the Seq Scan nodes in an EXPLAIN (FORMAT JSON) plan tree
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in CHECKED_TABLES:
+        found.append(plan["Relation Name"])
+    for sub in plan.get("Plans", []):
+        found += seq_scans(sub)
+    return found
+
+
+def check(dsn, real=False) -> list:
+    """[(label, problem)] for every endpoint query that needs a seq scan (or failed to plan)."""
+    failures = []
+    # the builders read app.fuzzy_search: set it for this database, and put it back afterwards
+    # (check() also runs inside pytest, next to tests of the app itself)
+    fuzzy_search = api.fuzzy_search
+    try:
+        _check(dsn, real, failures)
+    finally:
+        api.fuzzy_search = fuzzy_search
+    return failures
+
+
+def _check(dsn, real, failures):
+    with psycopg.connect(dsn) as conn:
+        cur = conn.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        api.fuzzy_search = cur.fetchone() is not None
+        if not real:
+            conn.execute("SET enable_seqscan = off")
+        for label, builder, kwargs, needs_trgm in PLAN_CHECKS:
+            if needs_trgm and not api.fuzzy_search:
+                print(f"plan_check: skip {label} (pg_trgm not installed)")
+                continue
+            sql, params = builder(**kwargs)
+            try:
+                cur = conn.execute("EXPLAIN (FORMAT JSON) " + sql.rstrip().rstrip(";"), params)
+                plan = cur.fetchone()[0][0]["Plan"]
+            except psycopg.Error as e:
+                conn.rollback()
+                failures.append((label, f"EXPLAIN failed: {e}"))
+                continue
+            tables = seq_scans(plan)
+            status = f"seq scan on {', '.join(sorted(set(tables)))}" if tables else "ok"
+            print(f"plan_check: {label:28} {status}")
+            if tables:
+                failures.append((label, status))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Fail if an endpoint query can't use an index.")
+    ap.add_argument("--dsn", default=api.dsn, help="default DATABASE_URL")
+    ap.add_argument("--real", action="store_true", help="don't disable seq scans (production-sized data)")
+    ap.add_argument("--migrate", action="store_true", help="apply pending migrations first")
+    args = ap.parse_args(argv)
+    if not args.dsn:
+        ap.error("no database: pass --dsn or set DATABASE_URL")
+    if args.migrate:
+        migrate(args.dsn)
+    failures = check(args.dsn, args.real)
+    for label, problem in failures:
+        print(f"plan_check: FAIL {label}: {problem}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
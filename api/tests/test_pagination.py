@@ -0,0 +1,171 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException, Response
+
+from api import app as api
+
+SEARCH_AFTER = ["Job1001-Client", "mu_sheet", "Job1001 MU.xlsx", 42]
+MATERIAL_AFTER = ["1001", 42]
+
+
+@pytest.fixture
+def fuzzy(monkeypatch):
+    monkeypatch.setattr(api, "fuzzy_search", True)
+
+
+def _raw_cursor(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+
+def _bad_request(fn, *args):
+    with pytest.raises(HTTPException) as e:
+        fn(*args)
+    assert e.value.status_code == 400
+
+
+@pytest.mark.parametrize("values", [
+    SEARCH_AFTER,
+    [0.8333333333333334, "Jöb 1001 – ünïcode", None, "a/b?c=d", 2**40],
+    [1e-17, "", "x" * 300, 7],
+])
+def test_cursor_round_trip(values):
+    cursor = api.encode_cursor(values)
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+    assert api.decode_cursor(cursor) == values
+
+
+@pytest.mark.parametrize("cursor", [None, ""])
+def test_no_cursor(cursor):
+    assert api.decode_cursor(cursor) is None
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    "abcde",  # base64 with an impossible length
+    _raw_cursor("not json"),
+    _raw_cursor(json.dumps({"job_name": "x"})),
+    _raw_cursor(json.dumps("Job1001")),
+    _raw_cursor(json.dumps(42)),
+])
+def test_decode_cursor_rejects(cursor):
+    _bad_request(api.decode_cursor, cursor)
+
+
+PLAIN = [api.CURSOR_TEXT, api.CURSOR_TEXT, api.CURSOR_TEXT, api.CURSOR_ID]
+RANKED = [api.CURSOR_RANK] + PLAIN
+
+
+@pytest.mark.parametrize("after, kinds", [
+    (None, PLAIN),
+    (SEARCH_AFTER, PLAIN),
+    (["Job1001-Client", None, "a.jpg", 1], PLAIN),  # NULL key columns sort too
+    ([0.5] + SEARCH_AFTER, RANKED),
+    ([1] + SEARCH_AFTER, RANKED),  # json writes 1.0 as 1
+])
+def test_check_cursor_accepts(after, kinds):
+    api.check_cursor(after, kinds)
+
+
+@pytest.mark.parametrize("after, kinds", [
+    ([], PLAIN),
+    (SEARCH_AFTER[:3], PLAIN),
+    (SEARCH_AFTER + [1], PLAIN),
+    ([0.5] + SEARCH_AFTER, PLAIN),  # ranked cursor on a plain query
+    (SEARCH_AFTER, RANKED),  # and the other way round
+])
+def test_check_cursor_wrong_arity(after, kinds):
+    _bad_request(api.check_cursor, after, kinds)
+
+
+@pytest.mark.parametrize("kinds, good", [(PLAIN, SEARCH_AFTER), (RANKED, [0.5] + SEARCH_AFTER)])
+@pytest.mark.parametrize("bad", [True, {"a": 1}, [1], "1.5", 1.5, None, 7])
+def test_check_cursor_wrong_type_in_each_position(kinds, good, bad):
+    for pos, kind in enumerate(kinds):
+        if isinstance(bad, kind) and not isinstance(bad, bool):
+            continue  # a valid value for this position
+        after = list(good)
+        after[pos] = bad
+        _bad_request(api.check_cursor, after, kinds)
+
+
+def _where(sql):
+    return sql.split("WHERE", 1)[1].split("ORDER BY")[0]
+
+
+def test_search_plain_without_cursor():
+    sql, params = api.search_query(job_id="1001", limit=11)
+    assert ">" not in _where(sql)
+    assert params == ["1001", 11]
+
+
+def test_search_plain_with_cursor():
+    sql, params = api.search_query(job_id="1001", limit=11, after=SEARCH_AFTER)
+    assert " AND (job_name, resource_type, filename, id) > (%s, %s, %s, %s)" in _where(sql)
+    assert params == ["1001"] + SEARCH_AFTER + [11]
+
+
+def test_search_ranked_without_cursor(fuzzy):
+    sql, params = api.search_query(name="gondola", limit=11)
+    assert "_rank <" not in sql and "::float8 <" not in sql
+    assert params == ["gondola", "%gondola%", "gondola", 11]
+
+
+def test_search_ranked_with_cursor(fuzzy):
+    after = [0.75] + SEARCH_AFTER
+    sql, params = api.search_query(name="gondola", limit=11, after=after)
+    rank = "(word_similarity(%s, job_name))::float8"
+    assert (f" AND ({rank} < %s OR ({rank} = %s AND (job_name, resource_type, filename, id)"
+            f" > (%s, %s, %s, %s)))") in _where(sql)
+    # rank term (SELECT), the match, then rank term + cursor rank, rank term + whole cursor
+    assert params == (["gondola", "%gondola%", "gondola", "gondola", 0.75, "gondola"] + after + [11])
+
+
+def test_search_cursor_shape_is_checked(fuzzy):
+    _bad_request(api.search_query, None, None, "gondola", None, (), 11, None, SEARCH_AFTER)
+    _bad_request(api.search_query, None, "1001", None, None, (), 11, None, [0.75] + SEARCH_AFTER)
+
+
+def test_material_usage_plain_without_cursor():
+    sql, params = api.material_usage_query(job_id="1001", limit=11)
+    assert "(mu_jobs.job_id, resources.id) >" not in sql
+    assert params == ["1001", 11]
+
+
+def test_material_usage_plain_with_cursor():
+    sql, params = api.material_usage_query(job_id="1001", limit=11, after=MATERIAL_AFTER)
+    assert " AND (mu_jobs.job_id, resources.id) > (%s, %s)" in _where(sql)
+    assert "HAVING" not in sql
+    assert params == ["1001"] + MATERIAL_AFTER + [11]
+
+
+def test_material_usage_ranked_without_cursor(fuzzy):
+    sql, params = api.material_usage_query(xb_type="white", limit=11)
+    assert "HAVING" not in sql
+    assert params == ["white", "%white%", "white", 11]
+
+
+def test_material_usage_ranked_with_cursor(fuzzy):
+    after = [1.5] + MATERIAL_AFTER
+    sql, params = api.material_usage_query(xb_type="white", limit=11, after=after)
+    rank = "(word_similarity(%s, xb_type))::float8"
+    assert (f"HAVING max({rank}) < %s OR (max({rank}) = %s AND (mu_jobs.job_id, resources.id) > (%s, %s))"
+            in sql)
+    assert params == ["white", "%white%", "white", "white", 1.5, "white"] + after + [11]
+
+
+def test_paginate_sets_next_cursor_on_a_full_page():
+    rows = [{"id": i, "job_id": "1001", "_rank": 1.0 - i / 10} for i in range(4)]
+    response = Response()
+    page = api.paginate(response, rows, 3, api.material_usage_key)
+    assert [r["id"] for r in page] == [0, 1, 2]
+    assert all("_rank" not in r for r in page)
+    assert api.decode_cursor(response.headers["X-Next-Cursor"]) == [0.8, "1001", 2]
+
+
+def test_paginate_last_page_has_no_cursor():
+    response = Response()
+    page = api.paginate(response, [{"id": 1, "job_id": "1001"}], 3, api.material_usage_key)
+    assert page == [{"id": 1, "job_id": "1001"}]
+    assert "X-Next-Cursor" not in response.headers
@@ -0,0 +1,15 @@
+import pytest
+
+from api import app as api
+from api import plan_check
+
+# plan_check against the configured database (DATABASE_URL / api/.env*): every endpoint query
+# has to be servable by an index. Apply the migrations first (python -m api.migrations).
+pytestmark = pytest.mark.skipif(not api.dsn, reason="no database configured (DATABASE_URL)")
+
+
+def test_endpoint_queries_use_an_index(monkeypatch):
+    monkeypatch.setattr(api, "fuzzy_search", "before")
+    failures = plan_check.check(api.dsn)
+    assert api.fuzzy_search == "before"  # check() sets it for the database it plans against
+    assert not failures, "\n".join(f"{label}: {problem}" for label, problem in failures)
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+
+from api import app as api
+
+
+@pytest.fixture(params=[False, True], ids=["ilike", "pg_trgm"])
+def fuzzy(request, monkeypatch):
+    monkeypatch.setattr(api, "fuzzy_search", request.param)
+    return request.param
+
+
+def _order_by(sql):
+    return sql.split("ORDER BY", 1)[1].split("LIMIT")[0].strip()
+
+
+def test_search_year_is_a_range_on_created_at():
+    sql, params = api.search_query(year=2024, types=["mu_sheet"])
+    assert "created_at >= %s AND created_at < %s" in sql
+    assert "EXTRACT" not in sql.upper() and "date_part" not in sql
+    assert params == [datetime(2024, 1, 1), datetime(2025, 1, 1), ["mu_sheet"], 100]
+
+
+def test_search_year_end_of_range():
+    _, params = api.search_query(year=9998, limit=5)
+    assert params == [datetime(9998, 1, 1), datetime(9999, 1, 1), 5]
+
+
+def test_search_order_by(fuzzy):
+    sql, _ = api.search_query(job_id="1001")
+    assert _order_by(sql) == "job_name, resource_type, filename, id"
+    sql, params = api.search_query(name="gondola")
+    if fuzzy:
+        assert _order_by(sql) == "_rank DESC, job_name, resource_type, filename, id"
+        assert "::float8 AS _rank" in sql
+        assert params == ["gondola", "%gondola%", "gondola", 100]
+    else:
+        assert _order_by(sql) == "job_name, resource_type, filename, id"
+        assert params == ["%gondola%", 100]
+
+
+def test_material_usage_order_by(fuzzy):
+    sql, _ = api.material_usage_query(job_id="1001")
+    assert sql.startswith("SELECT DISTINCT ")
+    assert _order_by(sql) == "job_id, id"
+    sql, _ = api.material_usage_query(xb_type="white")
+    if fuzzy:
+        assert "GROUP BY" in sql
+        assert _order_by(sql) == "_rank DESC, mu_jobs.job_id, resources.id"
+    else:
+        assert _order_by(sql) == "job_id, id"
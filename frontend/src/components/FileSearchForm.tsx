@@ -124,7 +124,7 @@ export const FileSearchForm = ({ onSearch, isLoading = false }: FileSearchFormPr
             </div>
 
             <div className="space-y-2">
-              <Label htmlFor="limit">Limit Results</Label>
+              <Label htmlFor="limit">Results per Page</Label>
               <Input
                 id="limit"
                 type="number"
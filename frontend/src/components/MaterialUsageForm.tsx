@@ -140,7 +140,7 @@ export const MaterialUsageForm = ({ onSearch, isLoading = false }: MaterialUsage
             </div>
             
             <div className="space-y-2">
-              <Label htmlFor="mu_limit">Limit Results</Label>
+              <Label htmlFor="mu_limit">Results per Page</Label>
               <Input
                 id="mu_limit"
                 type="number"
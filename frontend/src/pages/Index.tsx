@@ -1,5 +1,6 @@
 import { useState } from "react";
 import { Tabs, TabsContent, TabsList, TabsTrigger } from "@/components/ui/tabs";
+import { Button } from "@/components/ui/button";
 import { FileSearchForm } from "@/components/FileSearchForm";
 import { MaterialUsageForm } from "@/components/MaterialUsageForm";
 import { FileResults } from "@/components/FileResults";
@@ -17,7 +18,15 @@ interface FileResult {
   filename?: string;
 }
 
+// a page of results plus what to ask for the next one (the API puts the cursor in X-Next-Cursor)
+interface Paged {
+  params: URLSearchParams;
+  cursor: string | null;
+}
+
 const DEFAULT_API_BASE = (import.meta.env.VITE_API_URL || "/api").replace(/\/+$/, "");
+const PAGE_SIZE = 100;     // when the form doesn't say
+const MAX_PAGE_SIZE = 1000; // same cap as the forms' "Results per Page" input
 
 const Index = () => {
   const [apiBaseUrl, setApiBaseUrl] = useState(DEFAULT_API_BASE);
@@ -26,8 +35,22 @@ const Index = () => {
   const [materialResults, setMaterialResults] = useState<FileResult[]>([]);
   const [isSearchLoading, setIsSearchLoading] = useState(false);
   const [isMaterialLoading, setIsMaterialLoading] = useState(false);
+  const [searchPage, setSearchPage] = useState<Paged | null>(null);
+  const [materialPage, setMaterialPage] = useState<Paged | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const { toast } = useToast();
 
+  const fetchPage = async (path: string, params: URLSearchParams, cursor: string | null) => {
+    const query = new URLSearchParams(params);
+    // the form's limit is the page size; "Load more" fetches the next page of the same size
+    query.set("limit", String(Math.min(Number(params.get("limit")) || PAGE_SIZE, MAX_PAGE_SIZE)));
+    if (cursor) query.set("cursor", cursor);
+    const response = await fetch(`${apiBaseUrl}${path}?${query.toString()}`);
+    if (!response.ok) throw new Error(`Search failed: ${response.statusText}`);
+    const results: FileResult[] = await response.json();
+    return { results, next: response.headers.get("X-Next-Cursor") };
+  };
+
   const handleFileSearch = async (filters: any) => {
     setIsSearchLoading(true);
     try {
@@ -38,11 +61,10 @@ const Index = () => {
           else params.append(key, String(value));
         }
       });
-      const response = await fetch(`${apiBaseUrl}/search?${params.toString()}`);
-      if (!response.ok) throw new Error(`Search failed: ${response.statusText}`);
-      const results = await response.json();
+      const { results, next } = await fetchPage("/search", params, null);
       setSearchResults(results);
-      toast({ title: "Search Complete", description: `Found ${results.length} files matching your criteria.` });
+      setSearchPage({ params, cursor: next });
+      toast({ title: "Search Complete", description: `Found ${results.length}${next ? "+" : ""} files matching your criteria.` });
     } catch (error) {
       toast({ title: "Search Failed", description: error instanceof Error ? error.message : "An error occurred while searching.", variant: "destructive" });
     } finally {
@@ -57,11 +79,10 @@ const Index = () => {
       Object.entries(filters).forEach(([key, value]) => {
         if (value !== undefined && value !== "" && value !== 0) params.append(key, String(value));
       });
-      const response = await fetch(`${apiBaseUrl}/material_usage?${params.toString()}`);
-      if (!response.ok) throw new Error(`Material search failed: ${response.statusText}`);
-      const results = await response.json();
+      const { results, next } = await fetchPage("/material_usage", params, null);
       setMaterialResults(results);
-      toast({ title: "Material Search Complete", description: `Found ${results.length} material usage files matching your criteria.` });
+      setMaterialPage({ params, cursor: next });
+      toast({ title: "Material Search Complete", description: `Found ${results.length}${next ? "+" : ""} material usage files matching your criteria.` });
     } catch (error) {
       toast({ title: "Material Search Failed", description: error instanceof Error ? error.message : "An error occurred while searching materials.", variant: "destructive" });
     } finally {
@@ -69,6 +90,22 @@ const Index = () => {
     }
   };
 
+  const loadMore = async (path: string, page: Paged | null, setPage: (p: Paged) => void,
+                          setResults: (f: (prev: FileResult[]) => FileResult[]) => void) => {
+    // appends below what's shown (FileResults' isLoading would blank the list)
+    if (!page?.cursor) return;
+    setIsLoadingMore(true);
+    try {
+      const { results, next } = await fetchPage(path, page.params, page.cursor);
+      setResults(prev => [...prev, ...results]);
+      setPage({ params: page.params, cursor: next });
+    } catch (error) {
+      toast({ title: "Loading More Failed", description: error instanceof Error ? error.message : "An error occurred while loading more results.", variant: "destructive" });
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   return (
     <div className="min-h-screen bg-background">
       <div className="container mx-auto py-8 px-4 space-y-8">
@@ -103,11 +140,27 @@ const Index = () => {
           <TabsContent value="files" className="space-y-6">
             <FileSearchForm onSearch={handleFileSearch} isLoading={isSearchLoading} />
             <FileResults results={searchResults} isLoading={isSearchLoading} />
+            {searchPage?.cursor && (
+              <div className="flex justify-center">
+                <Button variant="outline" disabled={isSearchLoading || isLoadingMore}
+                        onClick={() => loadMore("/search", searchPage, setSearchPage, setSearchResults)}>
+                  Load more
+                </Button>
+              </div>
+            )}
           </TabsContent>
 
           <TabsContent value="materials" className="space-y-6">
             <MaterialUsageForm onSearch={handleMaterialSearch} isLoading={isMaterialLoading} />
             <FileResults results={materialResults} isLoading={isMaterialLoading} />
+            {materialPage?.cursor && (
+              <div className="flex justify-center">
+                <Button variant="outline" disabled={isMaterialLoading || isLoadingMore}
+                        onClick={() => loadMore("/material_usage", materialPage, setMaterialPage, setMaterialResults)}>
+                  Load more
+                </Button>
+              </div>
+            )}
           </TabsContent>
         </Tabs>
       </div>
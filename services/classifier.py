@@ -0,0 +1,90 @@
+import os
+from functools import lru_cache
+
+# One table for every resource type the crawler indexes. First matching rule wins, so order matters.
+#   dirs:       folder names that must all appear in the path below the job folder (case-insensitive);
+#               a tuple means "any of these"
+#   exts:       file extensions (lowercase, with dot)
+#   job_prefix: filename must start with "Job"
+RULES = [
+    {"type": "mu_sheet",              "dirs": ["sales", "material usages and factory handover"],
+     "exts": [".xlsx"],                "job_prefix": True},
+    {"type": "cut_file",              "dirs": ["design", "cut files", ("production", "1 off")],
+     "exts": [".ai"],                  "job_prefix": True},
+    {"type": "assembly_instructions", "dirs": ["pics and assembly"],
+     "exts": [".pdf"],                 "job_prefix": True},
+    {"type": "pics",                  "dirs": ["pics and assembly"],
+     "exts": [".jpg", ".jpeg"],        "job_prefix": False},
+    {"type": "low_res",               "dirs": ["design", "low res", ("production", "1 off")],
+     "exts": [".pdf"],                 "job_prefix": True},
+    {"type": "print_files",           "dirs": ["design", "print files", ("production", "1 off")],
+     "exts": [".pdf"],                 "job_prefix": True},
+    {"type": "set_up",                "dirs": ["design", "set up", ("production", "1 off")],
+     "exts": [".pdf"],                 "job_prefix": True},
+    {"type": "technical_drawings",    "dirs": ["design", "technical drawings"],
+     "exts": [".jpg", ".jpeg"],        "job_prefix": False},
+    {"type": "3d_file",               "dirs": ["design", "technical drawings"],
+     "exts": [".3dm"],                 "job_prefix": False},
+]
+
+
+def dir_part(name: str) -> str:
+    # how a folder name is compared against the rule table
+    return name.strip().lower()
+
+
+class Classifier:
+    """
+    RULES compiled into a matcher over path components.
+    The directory conditions are resolved once per directory (for_dir, cached on the set of
+    folder names the rules care about), so each file costs one extension lookup and a prefix
+    check, however many rules there are.
+    """
+
+    def __init__(self, rules=RULES):
+        self.rules = []
+        for order, rule in enumerate(rules):
+            groups = tuple(frozenset(dir_part(d) for d in (g if isinstance(g, tuple) else (g,)))
+                           for g in rule["dirs"])
+            exts = frozenset(e.lower() for e in rule["exts"])
+            self.rules.append((order, rule["type"], groups, exts, bool(rule["job_prefix"])))
+        # folder names any rule looks at; everything else is irrelevant to classification
+        self.names = frozenset(n for r in self.rules for g in r[2] for n in g)
+        self.exts = frozenset(e for r in self.rules for e in r[3])
+        self.types = [r[1] for r in self.rules]
+        self._for_names = lru_cache(maxsize=4096)(self._compile_dir)
+
+    def _compile_dir(self, present: frozenset) -> dict:
+        # {ext: ((job_prefix, resource_type), ...)} for the rules whose folders are all present
+        table = {}
+        for _, rtype, groups, exts, job_prefix in self.rules:
+            if all(g & present for g in groups):
+                for ext in exts:
+                    table.setdefault(ext, []).append((job_prefix, rtype))
+        return {ext: tuple(c) for ext, c in table.items()}
+
+    def for_dir(self, parts) -> dict:
+        # parts: folder names between the job folder and the file, already passed through dir_part()
+        return self._for_names(self.names.intersection(parts))
+
+    def match(self, table: dict, name: str):
+        # name: file name; table: for_dir() of its directory
+        name_lower = name.lower()
+        candidates = table.get(os.path.splitext(name_lower)[1])
+        if not candidates:
+            return None
+        is_jobfile = name_lower.startswith("job")
+        for job_prefix, rtype in candidates:
+            if is_jobfile or not job_prefix:
+                return rtype
+        return None
+
+    def classify(self, rel_path) -> str:
+        # rel_path: path of a file relative to its job folder, e.g. "Design/Cut Files/Production/Job1.ai"
+        parts = [dir_part(p) for p in str(rel_path).replace("\\", "/").split("/") if p]
+        if not parts:
+            return None
+        return self.match(self.for_dir(parts[:-1]), parts[-1])
+
+
+CLASSIFIER = Classifier()
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import crawler
+from classifier import CLASSIFIER, dir_part
+from crawl_metrics import CrawlMetrics
+from crawl_synth import mutate
+
+# Crawler benchmark over a tree from crawl_synth.py. For each scan strategy (--workers, with or
+# without the directory manifest) it runs three passes, the way the crawler would see them:
+#   cold         no job state / manifest, everything emitted
+#   incremental  after crawl_synth.mutate() (new files in the newest jobs, a new job folder)
+#   idle         nothing changed since the incremental pass
+# and times each stage on its own:
+#   scan      draining get_new_assets() (walk + classify + sort), with stat/dir-list counts
+#   classify  CLASSIFIER.for_dir/match over every file of the tree, no I/O (the CPU part of scan)
+#   insert    the rows through copy_rows (cold, like BULK_LOAD="auto") / insert_rows, in a
+#             scratch schema (BENCH_SCHEMA) so nothing real is touched; skipped without --dsn
+# --stat-latency / --list-latency add a sleep to every stat / directory listing, to get
+# SMB-like round trips out of a local disk.
+BENCH_SCHEMA = "crawl_bench"
+FALLBACK_DDL = {
+    "resources": "id serial PRIMARY KEY, job_id text, job_name text, resource_type text, "
+                 "abs_path text UNIQUE, filename text, created_at timestamp",
+}
+
+
+class _SlowEntry:
+    # os.DirEntry stand-in whose stat() pays the injected latency (is_dir comes with the listing)
+    __slots__ = ("_entry", "name", "path", "_latency")
+
+    def __init__(self, entry, latency):
+        self._entry, self.name, self.path, self._latency = entry, entry.name, entry.path, latency
+
+    def is_dir(self, follow_symlinks=True):
+        return self._entry.is_dir(follow_symlinks=follow_symlinks)
+
+    def is_file(self, follow_symlinks=True):
+        return self._entry.is_file(follow_symlinks=follow_symlinks)
+
+    def is_symlink(self):
+        return self._entry.is_symlink()
+
+    def stat(self, follow_symlinks=True):
+        time.sleep(self._latency)
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+    def __fspath__(self):
+        return self.path
+
+
+class _SlowScandir:
+    def __init__(self, it, latency):
+        self._it, self._latency = it, latency
+
+    def __iter__(self):
+        return (_SlowEntry(e, self._latency) for e in self._it)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def close(self):
+        self._it.close()
+
+
+@contextmanager
+def slow_fs(stat_latency=0.0, list_latency=0.0):
+    """Patch os.stat / os.scandir to sleep per call (seconds) while the block runs."""
+    if not stat_latency and not list_latency:
+        yield
+        return
+    real_stat, real_scandir = os.stat, os.scandir
+
+    def stat(*args, **kwargs):
+        time.sleep(stat_latency)
+        return real_stat(*args, **kwargs)
+
+    def scandir(*args, **kwargs):
+        time.sleep(list_latency)
+        return _SlowScandir(real_scandir(*args, **kwargs), stat_latency)
+
+    os.stat, os.scandir = stat, scandir
+    try:
+        yield
+    finally:
+        os.stat, os.scandir = real_stat, real_scandir
+
+
+def bench_classify(tree: Path) -> dict:
+    # the scan's per-directory / per-file classification work, on a listing taken beforehand
+    dirs = []
+    for job in sorted(os.listdir(tree)):
+        root = os.path.join(tree, job)
+        if not os.path.isdir(root):
+            continue
+        for dpath, _, files in os.walk(root):
+            rel = os.path.relpath(dpath, root)
+            parts = () if rel == "." else tuple(dir_part(p) for p in rel.split(os.sep))
+            dirs.append((parts, files))
+    n = sum(len(files) for _, files in dirs)
+    t0 = time.perf_counter()
+    matched = 0
+    for parts, files in dirs:
+        table = CLASSIFIER.for_dir(parts)
+        for name in files:
+            if CLASSIFIER.match(table, name):
+                matched += 1
+    secs = time.perf_counter() - t0
+    return {"files": n, "matched": matched, "dirs": len(dirs), "seconds": round(secs, 4),
+            "us_per_file": round(secs / n * 1e6, 3) if n else None}
+
+
+def scan(tree: Path, workers: int, job_states: dict, manifest, latency) -> tuple:
+    # one get_new_assets() pass; returns (result dict, rows, job updates, manifest updates)
+    metrics = CrawlMetrics()
+    manifest_updates, job_updates = {}, {}
+    with slow_fs(*latency):
+        t0 = time.perf_counter()
+        rows = list(crawler.get_new_assets([str(tree)], job_states, workers=workers, manifest=manifest,
+                                           manifest_updates=manifest_updates, job_updates=job_updates,
+                                           metrics=metrics))
+        secs = time.perf_counter() - t0
+    c = metrics.counts
+    return ({"seconds": round(secs, 3), "rows": len(rows), "jobs_scanned": c["jobs_scanned"],
+             "jobs_skipped": c["jobs_skipped"], "dirs_listed": c["dirs_listed"],
+             "dirs_unchanged": c["dirs_unchanged"], "entries_listed": c["entries_listed"],
+             "stats": c["stats"], "errors": sum(metrics.errors.values())},
+            rows, job_updates, manifest_updates)
+
+
+def insert(conn, rows, bulk: bool) -> dict:
+    # the crawl loop's batching, without the watermark / manifest writes
+    t0 = time.perf_counter()
+    batches = 0
+    for chunk in crawler.batched(rows, crawler.COPY_BATCH_SIZE if bulk else crawler.BATCH_SIZE):
+        if bulk:
+            crawler.copy_rows(conn, chunk)
+        else:
+            crawler.insert_rows(conn, chunk)
+        batches += 1
+    secs = time.perf_counter() - t0
+    return {"mode": "copy" if bulk else "values", "rows": len(rows), "batches": batches,
+            "seconds": round(secs, 3), "rows_per_sec": round(len(rows) / secs, 1) if secs and rows else None}
+
+
+def setup_schema(dsn):
+    conn = crawler.psycopg2.connect(dsn)
+    with conn, conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+        for table, ddl in FALLBACK_DDL.items():
+            cur.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+            if cur.fetchone()[0]:
+                cur.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+            else:
+                cur.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} ({ddl})")
+        cur.execute(f"SET search_path = {BENCH_SCHEMA}")
+        crawler.ensure_locations_table(cur)
+    conn.close()
+
+
+def run_strategy(tree: Path, workers: int, use_manifest: bool, latency, conn, seed: int) -> dict:
+    out = {}
+    if conn is not None:
+        with conn, conn.cursor() as cur:
+            cur.execute("TRUNCATE resources, mu_locations")
+
+    job_states, manifest = {}, ({} if use_manifest else None)
+    for phase in ("cold", "incremental", "idle"):
+        if phase == "incremental":
+            mutate(tree, seed=seed)
+        res, rows, job_updates, manifest_updates = scan(tree, workers, job_states, manifest, latency)
+        if conn is not None:
+            res["insert"] = insert(conn, rows, bulk=phase == "cold" and crawler.BULK_LOAD != "values")
+        out[phase] = res
+        # what crawl() would save after the pass
+        job_states.update(job_updates)
+        if manifest is not None:
+            for d, v in manifest_updates.items():
+                if v is None:
+                    manifest.pop(d, None)
+                else:
+                    manifest[d] = v
+        ins = res.get("insert")
+        print(f"crawl_bench: workers={workers} manifest={'on' if use_manifest else 'off'} {phase:11} "
+              f"scan {res['seconds']:>7.3f}s  {res['rows']:>6} row(s)  {res['stats']:>7} stat(s)  "
+              f"{res['dirs_listed']:>5} dir(s) listed  {res['jobs_skipped']:>5} job(s) skipped"
+              + (f"  insert {ins['seconds']:.3f}s ({ins['mode']})" if ins else ""))
+    return out
+
+
+def compare(report, baseline, tolerance) -> list:
+    # scan/insert seconds more than `tolerance` (fraction) above the baseline, per strategy and phase
+    out = []
+    for name, phases in report["strategies"].items():
+        for phase, cur in phases.items():
+            base = baseline.get("strategies", {}).get(name, {}).get(phase)
+            if not base:
+                continue
+            for key, cur_s, base_s in (("scan", cur["seconds"], base["seconds"]),
+                                       ("insert", cur.get("insert", {}).get("seconds"),
+                                        base.get("insert", {}).get("seconds"))):
+                if cur_s is not None and base_s and cur_s > base_s * (1 + tolerance):
+                    out.append(f"{name}.{phase}.{key}: {cur_s}s (baseline {base_s}s)")
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the crawler on a tree made by crawl_synth.py.")
+    ap.add_argument("tree", type=Path, help="folder written by crawl_synth.py (it is modified: "
+                                            "each strategy adds files / a job folder)")
+    ap.add_argument("--workers", default="1,8", help="scan worker counts to compare, comma separated")
+    ap.add_argument("--no-manifest", action="store_true", help="also run each worker count without the manifest")
+    ap.add_argument("--stat-latency", type=float, default=0.0, metavar="MS", help="sleep per stat call (ms)")
+    ap.add_argument("--list-latency", type=float, default=0.0, metavar="MS", help="sleep per directory listing (ms)")
+    ap.add_argument("--dsn", default=None, help=f"Postgres for the insert stage (tables go in schema "
+                                                f"{BENCH_SCHEMA}); without it inserts aren't timed")
+    ap.add_argument("--keep", action="store_true", help=f"keep schema {BENCH_SCHEMA} afterwards")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", default=None, metavar="PATH", help="write the report here")
+    ap.add_argument("--baseline", default=None, metavar="PATH", help="earlier --json report to compare with")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (fraction)")
+    args = ap.parse_args(argv)
+
+    latency = (args.stat_latency / 1000, args.list_latency / 1000)
+    report = {"tree": str(args.tree), "stat_latency_ms": args.stat_latency,
+              "list_latency_ms": args.list_latency, "started": time.time(),
+              "classify": bench_classify(args.tree), "strategies": {}}
+    cl = report["classify"]
+    print(f"crawl_bench: classify {cl['files']} file(s) in {cl['dirs']} dir(s): {cl['seconds']}s "
+          f"({cl['us_per_file']} us/file, {cl['matched']} matched)")
+
+    conn = None
+    if args.dsn:
+        setup_schema(args.dsn)
+        conn = crawler.psycopg2.connect(args.dsn, options=f"-c search_path={BENCH_SCHEMA}")
+    try:
+        for i, workers in enumerate(int(w) for w in args.workers.split(",") if w):
+            for use_manifest in ((True, False) if args.no_manifest else (True,)):
+                name = f"workers={workers}" + ("" if use_manifest else ",no-manifest")
+                report["strategies"][name] = run_strategy(args.tree, workers, use_manifest, latency, conn,
+                                                          seed=args.seed * 1000 + i * 2 + (not use_manifest))
+    finally:
+        if conn is not None:
+            conn.close()
+            if not args.keep:
+                drop = crawler.psycopg2.connect(args.dsn)
+                with drop, drop.cursor() as cur:
+                    cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+                drop.close()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(report, json.load(f), args.tolerance)
+        for line in slower:
+            print(f"crawl_bench: REGRESSION {line}")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
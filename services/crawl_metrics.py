@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from collections import Counter
+
+TOP_JOBS = 25  # slowest jobs listed in the report / exported as series
+BATCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)  # db batch seconds histogram (le)
+
+
+class CrawlMetrics:
+    """
+    Counters for one crawler run. Scan threads keep their own tallies per job and fold
+    them in once with add_job(), so the lock is taken once per job, not per entry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.finished = None
+        self.counts = Counter()        # dirs_listed, dirs_unchanged, entries_listed, stats, jobs_scanned, jobs_skipped
+        self.matches = Counter()       # resource_type -> classified files
+        self.errors = Counter()        # (where, exception class) -> n
+        self.server_seconds = {}       # server -> wall seconds
+        self.job_seconds = {}          # job_root -> wall seconds
+        self.batches = []              # (rows, seconds, mode)
+
+    def add_job(self, job_root: str, seconds: float, counts: Counter, matches: Counter, errors: Counter,
+                skipped=False):
+        with self._lock:
+            self.counts.update(counts)
+            self.counts["jobs_skipped" if skipped else "jobs_scanned"] += 1
+            self.matches.update(matches)
+            self.errors.update(errors)
+            if not skipped:
+                self.job_seconds[job_root] = seconds
+
+    def add_error(self, where: str, exc: BaseException):
+        # errors outside a job scan (e.g. listing a server root)
+        with self._lock:
+            self.errors[(where, type(exc).__name__)] += 1
+
+    def add_server(self, server: str, seconds: float):
+        with self._lock:
+            self.server_seconds[server] = self.server_seconds.get(server, 0.0) + seconds
+
+    def add_batch(self, rows: int, seconds: float, mode: str):
+        with self._lock:
+            self.batches.append((rows, seconds, mode))
+
+    def finish(self):
+        self.finished = time.time()
+
+    def report(self) -> dict:
+        end = self.finished or time.time()
+        slowest = sorted(self.job_seconds.items(), key=lambda kv: kv[1], reverse=True)[:TOP_JOBS]
+        secs = sorted(b[1] for b in self.batches)
+        return {
+            "started": self.started,
+            "seconds": round(end - self.started, 3),
+            "counts": dict(self.counts),
+            "matches": dict(self.matches),
+            "errors": {f"{where}:{kind}": n for (where, kind), n in self.errors.items()},
+            "server_seconds": {s: round(v, 3) for s, v in self.server_seconds.items()},
+            "slowest_jobs": [{"job": j, "seconds": round(v, 3)} for j, v in slowest],
+            "db_batches": {
+                "count": len(self.batches),
+                "rows": sum(b[0] for b in self.batches),
+                "seconds": round(sum(b[1] for b in self.batches), 3),
+                "max_seconds": round(secs[-1] if secs else 0.0, 3),
+                "p50_seconds": _quantile(secs, 0.5),
+                "p90_seconds": _quantile(secs, 0.9),
+                "p99_seconds": _quantile(secs, 0.99),
+                # cumulative, like the Prometheus histogram: batches that took <= le seconds
+                "buckets": {str(le): sum(1 for v in secs if v <= le) for le in BATCH_BUCKETS},
+                "batches": [{"rows": r, "seconds": round(v, 4), "mode": m} for r, v, m in self.batches],
+            },
+        }
+
+    def write_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+
+    def prometheus(self) -> str:
+        # text exposition format (e.g. for node_exporter's textfile collector)
+        rep = self.report()
+        out = []
+
+        def metric(name, kind, help_, samples):
+            out.append(f"# HELP crawler_{name} {help_}")
+            out.append(f"# TYPE crawler_{name} {kind}")
+            for labels, value in samples:
+                lbl = ",".join(f'{k}="{_esc(v)}"' for k, v in labels.items())
+                out.append(f"crawler_{name}{{{lbl}}} {value}" if lbl else f"crawler_{name} {value}")
+
+        metric("run_seconds", "gauge", "Wall time of the last crawler run.", [({}, rep["seconds"])])
+        metric("run_started_timestamp_seconds", "gauge", "Start of the last crawler run.", [({}, self.started)])
+        for key, help_ in (("dirs_listed", "Directories listed with scandir."),
+                           ("dirs_unchanged", "Directories skipped because the manifest mtime matched."),
+                           ("entries_listed", "Files seen in listed directories."),
+                           ("stats", "stat calls made on entries."),
+                           ("jobs_scanned", "Job folders walked."),
+                           ("jobs_skipped", "Job folders skipped after one stat.")):
+            metric(f"{key}_total", "counter", help_, [({}, rep["counts"].get(key, 0))])
+        metric("matches_total", "counter", "Classified files by resource type.",
+               [({"resource_type": t}, n) for t, n in sorted(self.matches.items())])
+        metric("errors_total", "counter", "Errors while scanning, by where and exception class.",
+               [({"where": w, "kind": k}, n) for (w, k), n in sorted(self.errors.items())])
+        metric("server_seconds", "gauge", "Wall time spent scanning each server.",
+               [({"server": s}, v) for s, v in rep["server_seconds"].items()])
+        metric("job_seconds", "gauge", f"Wall time of the {TOP_JOBS} slowest job folders.",
+               [({"job": j["job"]}, j["seconds"]) for j in rep["slowest_jobs"]])
+        db = rep["db_batches"]
+        metric("db_batch_seconds", "histogram", "Time per resources insert batch.", [])
+        for le, n in list(db["buckets"].items()) + [("+Inf", db["count"])]:
+            out.append(f'crawler_db_batch_seconds_bucket{{le="{le}"}} {n}')
+        out.append(f"crawler_db_batch_seconds_sum {rep['db_batches']['seconds']}")
+        out.append(f"crawler_db_batch_seconds_count {rep['db_batches']['count']}")
+        metric("db_rows_total", "counter", "Rows sent to resources.", [({}, rep["db_batches"]["rows"])])
+        return "\n".join(out) + "\n"
+
+    def write_prometheus(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.prometheus())
+
+
+def _quantile(sorted_values, q: float):
+    # nearest-rank quantile; None without samples
+    if not sorted_values:
+        return None
+    return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))], 3)
+
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
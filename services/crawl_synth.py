@@ -0,0 +1,120 @@
+import argparse
+import os
+import random
+import time
+from pathlib import Path
+
+# Synthetic job archive for benchmarking the crawler on local disk. Folder layout follows the shares:
+#   OUT/Job10001-Client/Sales/Material Usages and Factory Handover/Job10001 MU.xlsx
+#   OUT/Job10001-Client/Design/Cut Files/Production/Job10001 cut 1.ai
+#   OUT/Job10001-Client/Design/Low Res/Production/Job10001 low res 1.pdf
+#   OUT/Job10001-Client/Pics and Assembly/Job10001 assembly 1.pdf, IMG_0001.jpg
+# plus files no rule matches (working files, old revisions) so the walk lists more than it keeps.
+# Files are small placeholders (the crawler only lists and stats them); use mu_synth.py for MU
+# sheets the extractor can read. mtimes are back-dated so most jobs look idle to the crawler,
+# the newest ACTIVE_FRACTION of jobs look recently worked on.
+CLIENTS = ["Client", "Retail", "Expo", "Promo"]
+ACTIVE_FRACTION = 0.1
+IDLE_AGE_DAYS = (120, 6 * 365)  # back-dating range for idle jobs
+PLACEHOLDER = b"\0" * 256
+
+# name -> (folder below the job, filename pattern); {job} is the job number, {i} the file index
+LAYOUT = {
+    "mu":       (("Sales", "Material Usages and Factory Handover"), "Job{job} MU{i}.xlsx"),
+    "cut":      (("Design", "Cut Files", "Production"), "Job{job} cut {i}.ai"),
+    "low_res":  (("Design", "Low Res", "Production"), "Job{job} low res {i}.pdf"),
+    "assembly": (("Pics and Assembly",), "Job{job} assembly {i}.pdf"),
+    "pics":     (("Pics and Assembly",), "IMG_{i:04d}.jpg"),
+    "noise":    (("Design", "Working"), "draft {i}.psd"),
+}
+DEFAULT_COUNTS = {"mu": 1, "cut": 4, "low_res": 2, "assembly": 1, "pics": 12, "noise": 10}
+
+
+def _touch(path: Path, mtime: float):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(PLACEHOLDER)
+    os.utime(path, (mtime, mtime))
+
+
+def make_job(out: Path, job_no: int, rng, counts=None, mtime=None) -> Path:
+    """Write one job folder; returns its path. mtime: base mtime of its files (default now)."""
+    counts = DEFAULT_COUNTS if counts is None else counts
+    mtime = time.time() if mtime is None else mtime
+    root = out / f"Job{job_no}-{rng.choice(CLIENTS)}"
+    for kind, n in counts.items():
+        folder, pattern = LAYOUT[kind]
+        for i in range(1, n + 1):
+            _touch(root.joinpath(*folder, pattern.format(job=job_no, i=i)), mtime + rng.randrange(0, 30 * 86400))
+    return root
+
+
+def generate(out: Path, n: int, seed=0, counts=None, start_job=10001, active=ACTIVE_FRACTION) -> list:
+    """Write n job folders under out; returns their paths (oldest job number first)."""
+    rng = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    now = time.time()
+    n_active = int(n * active)
+    roots = []
+    for i in range(n):
+        if i >= n - n_active:
+            base = now - 30 * 86400  # files land in the last month
+        else:
+            base = now - rng.randrange(*IDLE_AGE_DAYS) * 86400
+        roots.append(make_job(out, start_job + i, rng, counts, mtime=base))
+    return roots
+
+
+def mutate(out: Path, seed=0, jobs=5, files=3, new_jobs=1, counts=None) -> int:
+    """
+    Simulate a day of work for an incremental crawl: `files` new cut/pics files in each of the
+    `jobs` newest job folders, plus `new_jobs` new job folders. Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    roots = sorted((p for p in out.iterdir() if p.is_dir() and p.name.lower().startswith("job")),
+                   key=lambda p: p.name)
+    now = time.time()
+    written = 0
+    for root in roots[-jobs:] if jobs else []:
+        job_no = root.name[3:].split("-")[0]
+        for _ in range(files):
+            kind = rng.choice(["cut", "pics"])
+            folder, pattern = LAYOUT[kind]
+            i = rng.randrange(1000, 10**6)
+            _touch(root.joinpath(*folder, pattern.format(job=job_no, i=i)), now)
+            written += 1
+    last = max((int(r.name[3:].split("-")[0]) for r in roots if r.name[3:].split("-")[0].isdigit()), default=10000)
+    counts = DEFAULT_COUNTS if counts is None else counts
+    for k in range(new_jobs):
+        make_job(out, last + 1 + k, rng, counts, mtime=now)
+        written += sum(counts.values())
+    return written
+
+
+def parse_counts(text: str) -> dict:
+    # "cut=10,pics=40" -> DEFAULT_COUNTS with those overridden
+    counts = dict(DEFAULT_COUNTS)
+    for part in filter(None, (p.strip() for p in (text or "").split(","))):
+        kind, _, n = part.partition("=")
+        if kind not in LAYOUT:
+            raise ValueError(f"unknown file kind {kind!r} (one of {', '.join(LAYOUT)})")
+        counts[kind] = int(n)
+    return counts
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate a synthetic job archive for crawl_bench.py.")
+    ap.add_argument("out", type=Path, help="output folder (stands in for a share root)")
+    ap.add_argument("-n", type=int, default=500, help="number of job folders")
+    ap.add_argument("--files", default="", metavar="KIND=N,...",
+                    help=f"files per job by kind, default {','.join(f'{k}={v}' for k, v in DEFAULT_COUNTS.items())}")
+    ap.add_argument("--active", type=float, default=ACTIVE_FRACTION, help="fraction of jobs with recent files")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    counts = parse_counts(args.files)
+    generate(args.out, args.n, args.seed, counts, active=args.active)
+    print(f"crawl_synth: {args.n} job folder(s), {args.n * sum(counts.values())} file(s) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import mu_extractor
+from mu_locator import ensure_locations_table, upsert_locations
+
+# Extractor benchmark over a corpus from mu_synth.py:
+#   stages: load_sheet / extract_jobs / extract_board / extract_dims per file, in this process,
+#           for each reader (openpyxl, xlsx_reader, xlsx_reader + early stop), checked against
+#           expected.jsonl
+#   loop:   mu_extractor.run() end to end against Postgres, in a scratch schema (BENCH_SCHEMA)
+#           so nothing real is touched: cold (empty parse cache) and warm (cache replay)
+# --json writes the numbers; --baseline compares files/s against an earlier --json and exits 1
+# on a drop bigger than --tolerance.
+BENCH_SCHEMA = "mu_bench"
+READERS = {
+    "openpyxl": dict(XLSX_STREAMING=False, XLSX_EARLY_STOP=False),
+    "stream": dict(XLSX_STREAMING=True, XLSX_EARLY_STOP=False),
+    "stream_stop": dict(XLSX_STREAMING=True, XLSX_EARLY_STOP=True),
+}
+# used when the real tables aren't there to copy (CREATE TABLE ... LIKE public.x)
+FALLBACK_DDL = {
+    "mu_jobs": "uid text PRIMARY KEY, job_id text, job_name text",
+    "mu_dimensions": "uid text PRIMARY KEY, width_mm int, height_mm int, depth_mm int",
+    "mu_boards": "uid text, xb_type text, thickness_mm text, size_text text, units_up numeric",
+}
+
+
+def peak_rss_mb():
+    # (this process, worker processes) peak RSS in MiB; None where the platform can't say
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20, None
+        except Exception:
+            return None, None
+    scale = 2**20 if sys.platform == "darwin" else 2**10  # ru_maxrss: bytes on macOS, KiB elsewhere
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    kids = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return round(own * 1024 / scale / 1024, 1), round(kids * 1024 / scale / 1024, 1)
+
+
+def load_expected(corpus: Path) -> list:
+    with open(corpus / "expected.jsonl", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def check(exp, job, dims, boards) -> bool:
+    got_boards = [[b["XB Type"], b["Thickness (mm)"], b["Size"], b["Units Up"]] for b in boards]
+    return (job is not None and job["Job ID"] == exp["job_no"] and job["Name"] == exp["job_name"]
+            and [dims["Width"], dims["Height"], dims["Depth"]] == exp["dims"]
+            and got_boards == exp["boards"])
+
+
+def bench_stages(expected, reader: str) -> dict:
+    for k, v in READERS[reader].items():
+        setattr(mu_extractor, k, v)
+    t = {"load": 0.0, "jobs": 0.0, "board": 0.0, "dims": 0.0}
+    wrong = []
+    start = time.perf_counter()
+    for exp in expected:
+        t0 = time.perf_counter()
+        vals, grid = mu_extractor.load_sheet(exp["path"])
+        t1 = time.perf_counter()
+        job = mu_extractor.extract_jobs(vals, exp["path"])
+        t2 = time.perf_counter()
+        uid = job["ID"] if job else "-"
+        boards = [r for r in mu_extractor.extract_board(uid, grid)
+                  if all((v is not None) and (str(v).strip() != "") for v in r.values())]
+        t3 = time.perf_counter()
+        dims = mu_extractor.extract_dims(uid, vals)
+        t4 = time.perf_counter()
+        t["load"] += t1 - t0
+        t["jobs"] += t2 - t1
+        t["board"] += t3 - t2
+        t["dims"] += t4 - t3
+        if not check(exp, job, dims, boards):
+            wrong.append(exp["path"])
+    wall = time.perf_counter() - start
+    n = len(expected)
+    return {
+        "files": n,
+        "seconds": round(wall, 3),
+        "files_per_sec": round(n / wall, 1) if wall else None,
+        "ms_per_file": {k: round(v / n * 1000, 3) for k, v in t.items()},
+        "mismatches": len(wrong),
+        "mismatch_examples": wrong[:5],
+    }
+
+
+def setup_schema(dsn, expected):
+    import psycopg
+    with psycopg.connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE; CREATE SCHEMA {BENCH_SCHEMA}")
+        for table, ddl in FALLBACK_DDL.items():
+            cur.execute("SELECT to_regclass(%s)", (f"public.{table}",))
+            if cur.fetchone()[0]:
+                cur.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} (LIKE public.{table} INCLUDING ALL)")
+            else:
+                cur.execute(f"CREATE TABLE {BENCH_SCHEMA}.{table} ({ddl})")
+        cur.execute(f"SET search_path = {BENCH_SCHEMA}")
+        ensure_locations_table(cur)
+        locs = []
+        for exp in expected:
+            st = os.stat(exp["path"])
+            locs.append((exp["job_folder"], exp["path"], st.st_size, int(st.st_mtime)))
+        upsert_locations(cur, locs)
+        conn.commit()
+
+
+def reset_watermark(dsn):
+    import psycopg
+    with psycopg.connect(dsn) as conn:
+        conn.execute("DELETE FROM etl_state WHERE process = %s", (mu_extractor.PROCESS,))
+
+
+def bench_loop(dsn, n_files, workers, label) -> dict:
+    # times mu_extractor.run(); DB time is what write_mu_batch took, the rest is parse / wait
+    db = {"seconds": 0.0, "batches": 0}
+    write = mu_extractor.write_mu_batch
+
+    def timed_write(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return write(*args, **kwargs)
+        finally:
+            db["seconds"] += time.perf_counter() - t0
+            db["batches"] += 1
+
+    mu_extractor.write_mu_batch = timed_write
+    try:
+        t0 = time.perf_counter()
+        written = mu_extractor.run(dsn, workers=workers)
+        wall = time.perf_counter() - t0
+    finally:
+        mu_extractor.write_mu_batch = write
+    own, kids = peak_rss_mb()
+    print(f"mu_bench: loop {label}: {written}/{n_files} written in {wall:.2f}s")
+    return {
+        "files": n_files,
+        "written": written,
+        "seconds": round(wall, 3),
+        "files_per_sec": round(n_files / wall, 1) if wall else None,
+        "db_seconds": round(db["seconds"], 3),
+        "db_batches": db["batches"],
+        "peak_rss_mb": own,
+        "peak_rss_workers_mb": kids,
+    }
+
+
+def compare(report, baseline, tolerance) -> list:
+    # "section.name" entries whose files/s fell more than `tolerance` (fraction) below the baseline
+    out = []
+    for section in ("stages", "loop"):
+        for name, cur in report.get(section, {}).items():
+            base = baseline.get(section, {}).get(name)
+            if base and base.get("files_per_sec") and cur.get("files_per_sec") is not None:
+                if cur["files_per_sec"] < base["files_per_sec"] * (1 - tolerance):
+                    out.append(f"{section}.{name}: {cur['files_per_sec']} files/s "
+                               f"(baseline {base['files_per_sec']})")
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark mu_extractor on a corpus made by mu_synth.py.")
+    ap.add_argument("corpus", type=Path, help="folder written by mu_synth.py")
+    ap.add_argument("--dsn", default=mu_extractor.DB_DSN,
+                    help=f"Postgres for the loop benchmark (tables go in schema {BENCH_SCHEMA}); "
+                         "default DATABASE_URL")
+    ap.add_argument("--workers", type=int, default=mu_extractor.PARSE_WORKERS)
+    ap.add_argument("--readers", default=",".join(READERS), help="stage benchmark readers, comma separated")
+    ap.add_argument("--no-loop", action="store_true", help="stage benchmark only (no database)")
+    ap.add_argument("--keep", action="store_true", help=f"keep schema {BENCH_SCHEMA} afterwards")
+    ap.add_argument("--json", default=None, metavar="PATH", help="write the report here")
+    ap.add_argument("--baseline", default=None, metavar="PATH", help="earlier --json report to compare with")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="allowed files/s drop vs baseline (fraction)")
+    args = ap.parse_args(argv)
+
+    expected = load_expected(args.corpus)
+    report = {"corpus": str(args.corpus), "files": len(expected), "workers": args.workers,
+              "started": time.time(), "stages": {}, "loop": {}}
+
+    for reader in [r for r in args.readers.split(",") if r]:
+        res = report["stages"][reader] = bench_stages(expected, reader)
+        ms = res["ms_per_file"]
+        print(f"mu_bench: stages {reader:12} {res['files_per_sec']:>8} files/s  "
+              f"load {ms['load']:.2f}  jobs {ms['jobs']:.2f}  board {ms['board']:.2f}  "
+              f"dims {ms['dims']:.2f} ms/file  mismatches {res['mismatches']}")
+
+    if not args.no_loop:
+        if not args.dsn:
+            raise RuntimeError("no --dsn and DATABASE_URL is not set (use --no-loop to skip the DB)")
+        from psycopg.conninfo import make_conninfo
+        dsn = make_conninfo(args.dsn, options=f"-c search_path={BENCH_SCHEMA}")
+        for k, v in READERS["stream_stop"].items():
+            setattr(mu_extractor, k, v)
+        setup_schema(args.dsn, expected)
+        try:
+            report["loop"]["cold"] = bench_loop(dsn, len(expected), args.workers, "cold")
+            reset_watermark(dsn)
+            report["loop"]["warm"] = bench_loop(dsn, len(expected), args.workers, "warm (parse cache)")
+        finally:
+            if not args.keep:
+                import psycopg
+                with psycopg.connect(args.dsn) as conn:
+                    conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        for name, res in report["loop"].items():
+            print(f"mu_bench: loop {name:6} {res['files_per_sec']:>8} files/s  db {res['db_seconds']}s "
+                  f"in {res['db_batches']} batch(es)  peak RSS {res['peak_rss_mb']} MiB "
+                  f"(workers {res['peak_rss_workers_mb']} MiB)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            slower = compare(report, json.load(f), args.tolerance)
+        for line in slower:
+            print(f"mu_bench: REGRESSION {line}")
+        if slower:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
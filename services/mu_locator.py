@@ -1,14 +1,20 @@
 import hashlib
+import argparse
+import re
 from pathlib import Path
-from typing import Union
-from psycopg import Cursor
+from typing import Union, TYPE_CHECKING
 import os
-from pathlib import Path
-import psycopg
-from psycopg.rows import dict_row
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from psycopg import Cursor
+
+# psycopg is only imported by scan_and_upsert(): crawler.py imports this module for
+# upsert_scanned() and hands it psycopg2 cursors
+
 ROOTS = [Path(r"X:\\")]
+# where MU sheets live below a job folder (compared lowercased); only files directly in it count
+MU_FOLDER = ("sales", "material usages and factory handover")
 
 from urllib.parse import urlparse
 
@@ -16,18 +22,6 @@ from urllib.parse import urlparse
 load_dotenv(dotenv_path=Path(__file__).with_name('.env'))
 
 DB_DSN = (os.getenv("DATABASE_URL") or "").strip().strip('"').strip("'")
-print("DSN loaded:", bool(DB_DSN), "len:", len(DB_DSN))
-try:
-    u = urlparse(DB_DSN)
-    print("DB host:", u.hostname, "port:", u.port, "scheme:", u.scheme)
-except Exception as e:
-    print("Could not parse DSN:", e)
-
-load_dotenv(dotenv_path=Path(__file__).with_name('.env'))
-
-DB_DSN = os.getenv("DATABASE_URL")
-if not DB_DSN:
-    raise RuntimeError("DATABASE_URL is not set. Add it to services/mu_extractor/.env")
 
 def make_uid(filepath: Union[str, Path]) -> str:
     """
@@ -39,42 +33,160 @@ def make_uid(filepath: Union[str, Path]) -> str:
     h = hashlib.sha256(norm.encode("utf-8")).hexdigest()
     return h[:6]  
 
-def upsert_location(cur: Cursor, job_name: str, filepath: Union[str, Path]) -> str:
+LOCATOR_BATCH_SIZE = 1000  # locations per INSERT ... SELECT FROM unnest()
+
+def ensure_locations_table(cur):
+    # size/mtime of the workbook as last seen, so an unchanged file doesn't bump updated_at
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS mu_locations (
+      uid        text PRIMARY KEY,
+      job_name   text,
+      filepath   text,
+      updated_at timestamptz NOT NULL DEFAULT now()
+    );
+    ALTER TABLE mu_locations ADD COLUMN IF NOT EXISTS size_bytes bigint;
+    ALTER TABLE mu_locations ADD COLUMN IF NOT EXISTS file_mtime bigint;
+    """)
+
+def upsert_locations(cur, locations) -> int:
     """
-    Upsert (uid, job_name, filepath) into mu_locations.
-    Returns the uid for convenience.
+    Bulk upsert into mu_locations. locations: iterable of (job_name, filepath, size_bytes, mtime_epoch).
+    Existing rows are only updated (and updated_at only bumped) when job name, size or mtime
+    differ, so mu_extractor's updated_at watermark only sees real changes.
+    Works with psycopg and psycopg2 cursors. Returns the number of rows inserted or changed.
     """
-    uid = make_uid(filepath)
+    batch = {}
+    changed = 0
+    for job_name, filepath, size, mtime in locations:
+        # keyed on uid: one statement can't touch the same row twice
+        batch[make_uid(filepath)] = (job_name, str(filepath), size, mtime)
+        if len(batch) >= LOCATOR_BATCH_SIZE:
+            changed += _upsert_batch(cur, batch)
+            batch = {}
+    if batch:
+        changed += _upsert_batch(cur, batch)
+    return changed
+
+def _upsert_batch(cur, batch: dict) -> int:
+    uids = list(batch)
+    jobs, paths, sizes, mtimes = (list(col) for col in zip(*batch.values()))
+    # uid comes from the lowercased path, so a conflict is the same file: keep the stored
+    # spelling of filepath (the crawler and this scan case folders differently, and
+    # mu_extractor hashes the raw filepath for its own uid)
+    # rows from before size/mtime were tracked (both NULL) just get them filled in: updated_at
+    # stays, or the first run would send every known sheet back through mu_extractor
     cur.execute(
         """
-        INSERT INTO mu_locations (uid, job_name, filepath)
-        VALUES (%s, %s, %s)
+        INSERT INTO mu_locations (uid, job_name, filepath, size_bytes, file_mtime)
+        SELECT * FROM unnest(%s::text[], %s::text[], %s::text[], %s::bigint[], %s::bigint[])
         ON CONFLICT (uid) DO UPDATE
-          SET job_name = EXCLUDED.job_name,
-              filepath = EXCLUDED.filepath,
-              updated_at = now();
+          SET job_name   = EXCLUDED.job_name,
+              size_bytes = EXCLUDED.size_bytes,
+              file_mtime = EXCLUDED.file_mtime,
+              updated_at = CASE WHEN mu_locations.size_bytes IS NULL AND mu_locations.file_mtime IS NULL
+                                 AND mu_locations.job_name IS NOT DISTINCT FROM EXCLUDED.job_name
+                                THEN mu_locations.updated_at ELSE now() END
+          WHERE (mu_locations.job_name, mu_locations.size_bytes, mu_locations.file_mtime)
+            IS DISTINCT FROM (EXCLUDED.job_name, EXCLUDED.size_bytes, EXCLUDED.file_mtime)
+        RETURNING updated_at = now();
         """,
-        (uid, job_name, str(filepath)),
+        (uids, jobs, paths, sizes, mtimes),
     )
-    return uid
+    # inserted or really changed; backfilled rows kept their old updated_at
+    return sum(1 for (bumped,) in cur.fetchall() if bumped)
 
-def scan_and_upsert(dsn=DB_DSN):
-    total = 0
-    with psycopg.connect(dsn, row_factory=dict_row) as con, con.cursor() as cur:
-        for root in ROOTS:
-            if not root.exists():
+def upsert_location(cur: "Cursor", job_name: str, filepath: Union[str, Path]) -> str:
+    """
+    Upsert one file into mu_locations (stats it for size/mtime).
+    Returns the uid for convenience.
+    """
+    st = os.stat(filepath)
+    upsert_locations(cur, [(job_name, filepath, st.st_size, int(st.st_mtime))])
+    return make_uid(filepath)
+
+def _in_mu_folder(abs_path: str, job_name: str) -> bool:
+    # <job>/Sales/Material Usages and Factory Handover/<file>, like iter_locations walks; the
+    # crawler's mu_sheet rule also matches subfolders (Old/, Superseded/) that were never extracted
+    parts = [p.strip().lower() for p in re.split(r"[\\/]+", str(abs_path)) if p]
+    job = job_name.strip().lower()
+    if job not in parts:
+        return False
+    return tuple(parts[parts.index(job) + 1:-1]) == MU_FOLDER
+
+def upsert_scanned(cur, rows) -> int:
+    """
+    Feed mu_locations from crawler rows (resources column names + size_bytes), so the crawler's
+    single walk does this module's job: every file it tags mu_sheet that sits directly in a job's
+    MU_FOLDER is a location (on every root the crawler walks, not just ROOTS).
+    Returns the number of locations inserted or changed.
+    """
+    return upsert_locations(cur, (
+        (r["job_name"], r["abs_path"], r["size_bytes"], r["mtime_epoch"])
+        for r in rows if r["resource_type"] == "mu_sheet" and _in_mu_folder(r["abs_path"], r["job_name"])
+    ))
+
+def iter_locations(roots=None):
+    # standalone walk of ROOTS -> (job_name, filepath, size_bytes, mtime_epoch)
+    for root in roots or ROOTS:
+        if not root.exists():
+            continue
+        for job_dir in (p for p in root.iterdir() if p.is_dir()):
+            mufh_dir = job_dir / "sales" / "Material usages and Factory handover"
+            if not mufh_dir.is_dir():
                 continue
-            for job_dir in (p for p in root.iterdir() if p.is_dir()):
-                job_name = job_dir.name
-                mufh_dir = job_dir / "sales" / "Material usages and Factory handover"
-                if not mufh_dir.is_dir():
-                    continue
-                for f in mufh_dir.iterdir():
-                    if f.is_file() and f.suffix.lower() in (".xlsx", ".xls"):
-                        upsert_location(cur, job_name=job_name, filepath=f)
-                        total += 1
+            for f in mufh_dir.iterdir():
+                if f.suffix.lower() in (".xlsx", ".xls") and f.is_file():
+                    st = f.stat()
+                    yield job_dir.name, f, st.st_size, int(st.st_mtime)
+
+def scan_and_upsert(dsn=DB_DSN, roots=None, dry_run=False):
+    # crawler.py now feeds mu_locations from its own scan (upsert_scanned), so this is only
+    # needed to bootstrap or to repair the table
+    if dry_run:
+        seen = 0
+        for job_name, f, size, mtime in iter_locations(roots):
+            print(f"[DRY] {make_uid(f)} {job_name}: {f} ({size} bytes)")
+            seen += 1
+        print(f"mu_locator: {seen} file(s) found, dry run, nothing written")
+        return 0
+
+    import psycopg
+    from psycopg.rows import dict_row
+    seen = 0
+    def counted():
+        nonlocal seen
+        for loc in iter_locations(roots):
+            seen += 1
+            yield loc
+    with psycopg.connect(dsn, row_factory=dict_row) as con, con.cursor() as cur:
+        ensure_locations_table(cur)
+        changed = upsert_locations(cur, counted())
         con.commit()
-    print(f"mu_locator: upserted {total} rows into mu_locations")
+    print(f"mu_locator: {seen} file(s) found, {changed} row(s) inserted/changed in mu_locations")
+    return changed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Walk the job shares for MU sheets and upsert them into mu_locations "
+                                             "(crawler.py does this as part of its crawl).")
+    ap.add_argument("--root", action="append", type=Path, default=None,
+                    help=f"share root to walk (repeatable, default {', '.join(map(str, ROOTS))})")
+    ap.add_argument("--dry-run", action="store_true", help="list what would be upserted, write nothing")
+    args = ap.parse_args(argv)
+    if args.dry_run:
+        scan_and_upsert(roots=args.root, dry_run=True)
+        return
+
+    print("DSN loaded:", bool(DB_DSN), "len:", len(DB_DSN))
+    try:
+        u = urlparse(DB_DSN)
+        print("DB host:", u.hostname, "port:", u.port, "scheme:", u.scheme)
+    except Exception as e:
+        print("Could not parse DSN:", e)
+    if not DB_DSN:
+        raise RuntimeError("DATABASE_URL is not set. Add it to services/mu_extractor/.env")
+    scan_and_upsert(DB_DSN, roots=args.root)
 
 
-scan_and_upsert(DB_DSN)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import json
+import random
+from pathlib import Path
+
+import openpyxl
+from openpyxl.styles import PatternFill
+
+# Synthetic MU sheets for benchmarking / checking mu_extractor without the production share.
+# Workbooks follow the template the extractor expects ("BOARD REQUIRED" section, "Dims" cell,
+# job no / name near the top, 18 columns wide) with the variations seen in real sheets.
+# Files land in the same folder layout as the share, so the crawler can walk them too:
+#   OUT/Job10001-Client/Sales/Material Usages and Factory Handover/Job10001 MU.xlsx
+# and OUT/expected.jsonl has what the extractor should find in each one.
+SHEET_WIDTH = 18
+MU_DIR = ("Sales", "Material Usages and Factory Handover")
+
+XB_TYPES = ["XB White", "XB Brown", "XB Print", "XB Kraft", "XB Black", "XB Digital White"]
+THICKNESSES = ["10mm", "16mm", "22 mm", "10", "16 MM"]
+SIZES = ["2440x1220", "2440 x 1220", "3050x1220", "1830x1220"]
+END_ANCHORS = ["HARDWARE", "ELECTRICAL", "OUTSOURCED", "FINISHING"]
+CLIENTS = ["Client", "Retail", "Expo", "Promo"]
+
+
+def job_no_cells(job_no: int, rng):
+    # the ways sheets give the job number: inline text, or a label with the value in the next cell
+    style = rng.randrange(5)
+    if style == 0:
+        return [f"Job no: {job_no}"]
+    if style == 1:
+        return [f"Job number {job_no}"]
+    if style == 2:
+        return [f"Job #{job_no}"]
+    if style == 3:
+        return ["Job no:", job_no]
+    return ["Job No.", str(job_no)]
+
+
+def dims_text(w: int, h: int, d: int, rng):
+    # (text, expected mm) in mm / cm / m, labelled or not
+    style = rng.randrange(5)
+    if style == 0:
+        return f"{w}w x {h}h x {d}d mm", (w, h, d)
+    if style == 1:
+        return f"{w} x {h} x {d}mm", (w, h, d)
+    if style == 2:
+        w, h, d = (round(v, -1) for v in (w, h, d))
+        return f"{w // 10}cm x {h // 10}cm x {d // 10}cm", (w, h, d)
+    if style == 3:
+        w, h, d = (round(v, -2) for v in (w, h, d))
+        return f"{w / 1000:g}m x {h / 1000:g}m x {d / 1000:g}m", (w, h, d)
+    return f"{w}W {h}H {d}D", (w, h, d)
+
+
+def make_sheet(path: Path, job_no: int, rng, boards=None, header=None, padding_rows=None):
+    """
+    Write one MU workbook; returns what the extractor should find
+    ({"job_no", "job_name", "dims", "boards"}).
+    """
+    boards = rng.choice([0, 1, 2, 3, 5, 8, 12, 20, 40]) if boards is None else boards
+    header = rng.random() < 0.7 if header is None else header
+    padding_rows = rng.choice([0, 0, 50, 200, 1000]) if padding_rows is None else padding_rows
+
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Sheet1"
+    ws.cell(row=1, column=1, value="MATERIAL USAGE & FACTORY HANDOVER")
+    ws.cell(row=1, column=SHEET_WIDTH, value="Rev 3")
+
+    for i, v in enumerate(job_no_cells(job_no, rng), 1):
+        ws.cell(row=2, column=i, value=v)
+    job_name = f"{rng.choice(['Gondola', 'Plinth', 'FSDU', 'Counter Unit', 'Backwall'])} {job_no}"
+    ws.cell(row=3, column=1, value=rng.choice(["Job Name:", "Project name"]))
+    ws.cell(row=3, column=2, value=job_name)
+    ws.cell(row=3, column=8, value="Date:")
+    ws.cell(row=3, column=9, value="2026-01-15")
+
+    w, h, d = rng.randrange(300, 2400), rng.randrange(300, 2400), rng.randrange(200, 900)
+    text, dims = dims_text(w, h, d, rng)
+    ws.cell(row=4, column=1, value="Dims")
+    ws.cell(row=4, column=2, value=text)
+
+    anchor = 6
+    ws.cell(row=anchor, column=1, value="BOARD REQUIRED")
+    if header:
+        for col, name in zip((1, 2, 3, 5), ("XB Type", "Thickness", "Size", "Units Up")):
+            ws.cell(row=anchor + 2, column=col, value=name)
+    expected = []
+    r = anchor + 3
+    for _ in range(boards):
+        row = (rng.choice(XB_TYPES), rng.choice(THICKNESSES), rng.choice(SIZES), rng.randrange(1, 60))
+        for col, v in zip((1, 2, 3, 5), row):
+            ws.cell(row=r, column=col, value=v)
+        ws.cell(row=r, column=7, value=rng.choice(["", "cut on Zund", "print first"]) or None)
+        expected.append([row[0], row[1].strip()[:-2].strip() if row[1].lower().endswith("mm") else row[1],
+                         row[2], row[3]])
+        r += 1
+    r += 1
+    ws.cell(row=r, column=1, value=rng.choice(END_ANCHORS))
+    for i in range(rng.randrange(3, 15)):
+        ws.cell(row=r + 1 + i, column=1, value=f"item {i}")
+        ws.cell(row=r + 1 + i, column=4, value=rng.randrange(1, 100))
+
+    # formatted-but-empty cells below the content, the way templates grow their <dimension>
+    fill = PatternFill("solid", fgColor="FFF2CC")
+    for pr in range(r + 20, r + 20 + padding_rows):
+        ws.cell(row=pr, column=SHEET_WIDTH).fill = fill
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return {"job_no": str(job_no), "job_name": job_name, "dims": list(dims), "boards": expected}
+
+
+def generate(out: Path, n: int, seed=0, start_job=10001):
+    rng = random.Random(seed)
+    out.mkdir(parents=True, exist_ok=True)
+    with open(out / "expected.jsonl", "w", encoding="utf-8") as f:
+        for i in range(n):
+            job_no = start_job + i
+            folder = f"Job{job_no}-{rng.choice(CLIENTS)}"
+            path = out.joinpath(folder, *MU_DIR, f"Job{job_no} MU.xlsx")
+            exp = make_sheet(path, job_no, rng)
+            exp["path"] = str(path)
+            exp["job_folder"] = folder
+            f.write(json.dumps(exp) + "\n")
+    return n
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate synthetic MU sheets (and expected.jsonl) for mu_bench.py.")
+    ap.add_argument("out", type=Path, help="output folder (share-like layout)")
+    ap.add_argument("-n", type=int, default=200, help="number of workbooks")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    generate(args.out, args.n, args.seed)
+    print(f"mu_synth: {args.n} workbook(s) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
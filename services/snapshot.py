@@ -0,0 +1,144 @@
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+# Columnar snapshot of every file a full crawl listed, so classification can be re-run without
+# walking the shares again (see `crawler.py reclassify`).
+#
+# Layout (little-endian):
+#   MAGIC, <d created epoch> <d finished epoch>   (finished is filled in by close(); 0 until then)
+#   repeated blocks: <I n entries> <I compressed length> zlib(payload)
+#   payload: mtime int64[n] | size int64[n] | job index uint32[n]
+#            | <I jobs length> job roots "\0"-joined | relative paths "\0"-joined
+MAGIC = b"XSNAP2\n"
+MAGIC_V1 = b"XSNAP1\n"  # older files: created only
+BLOCK_SIZE = 50_000  # entries per compressed block; bounds memory on both write and read
+
+_HEADER = struct.Struct("<dd")
+_HEADER_V1 = struct.Struct("<d")
+_BLOCK = struct.Struct("<II")
+_U32 = struct.Struct("<I")
+
+
+def _le(arr: array) -> array:
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+class SnapshotWriter:
+    """
+    Append entries (job root, path relative to it, size, mtime) and they are written out
+    in compressed columnar blocks. The file only replaces `path` on a clean close(), which
+    also stamps the finish time: whatever the crawl saved between the two describes the snapshot,
+    so close it after the crawl's own state is written.
+    """
+
+    def __init__(self, path, block_size=BLOCK_SIZE):
+        self.path = str(path)
+        self.block_size = block_size
+        self.count = 0
+        self._tmp = self.path + ".tmp"
+        self._f = open(self._tmp, "wb")
+        self.created = time.time()
+        self._f.write(MAGIC + _HEADER.pack(self.created, 0.0))
+        self._reset()
+
+    def _reset(self):
+        self._mtimes, self._sizes, self._jobs_idx = array("q"), array("q"), array("I")
+        self._jobs, self._job_ix, self._paths = [], {}, []
+
+    def add(self, job_root: str, rel_path: str, size: int, mtime: int):
+        ix = self._job_ix.get(job_root)
+        if ix is None:
+            ix = self._job_ix[job_root] = len(self._jobs)
+            self._jobs.append(job_root)
+        self._mtimes.append(int(mtime))
+        self._sizes.append(int(size))
+        self._jobs_idx.append(ix)
+        self._paths.append(rel_path)
+        if len(self._paths) >= self.block_size:
+            self._flush()
+
+    def _flush(self):
+        n = len(self._paths)
+        if not n:
+            return
+        jobs = "\0".join(self._jobs).encode("utf-8", "surrogateescape")
+        payload = b"".join((
+            _le(self._mtimes).tobytes(), _le(self._sizes).tobytes(), _le(self._jobs_idx).tobytes(),
+            _U32.pack(len(jobs)), jobs,
+            "\0".join(self._paths).encode("utf-8", "surrogateescape"),
+        ))
+        data = zlib.compress(payload, 6)
+        self._f.write(_BLOCK.pack(n, len(data)))
+        self._f.write(data)
+        self.count += n
+        self._reset()
+
+    def close(self):
+        self._flush()
+        self._f.seek(len(MAGIC))
+        self._f.write(_HEADER.pack(self.created, time.time()))
+        self._f.close()
+        os.replace(self._tmp, self.path)
+
+    def abort(self):
+        self._f.close()
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def _read_header(f, path) -> tuple:
+    magic = f.read(len(MAGIC))
+    if magic == MAGIC:
+        return _HEADER.unpack(f.read(_HEADER.size))
+    if magic == MAGIC_V1:
+        return _HEADER_V1.unpack(f.read(_HEADER_V1.size))[0], None
+    raise ValueError(f"{path} is not a crawl snapshot")
+
+
+def snapshot_times(path) -> tuple:
+    """(created, finished) epochs; finished is None for files written before it was recorded."""
+    with open(path, "rb") as f:
+        return _read_header(f, path)
+
+
+def read_snapshot(path):
+    """Yield (job_root, rel_path, size, mtime) for every entry, one block in memory at a time."""
+    with open(path, "rb") as f:
+        _read_header(f, path)
+        while True:
+            head = f.read(_BLOCK.size)
+            if not head:
+                return
+            n, clen = _BLOCK.unpack(head)
+            payload = zlib.decompress(f.read(clen))
+            off = 0
+            cols = []
+            for code, width in (("q", 8), ("q", 8), ("I", 4)):
+                arr = array(code)
+                arr.frombytes(payload[off:off + n * width])
+                cols.append(_le(arr))
+                off += n * width
+            mtimes, sizes, jobs_idx = cols
+            (jlen,) = _U32.unpack_from(payload, off)
+            off += _U32.size
+            jobs = payload[off:off + jlen].decode("utf-8", "surrogateescape").split("\0")
+            paths = payload[off + jlen:].decode("utf-8", "surrogateescape").split("\0")
+            for i in range(n):
+                yield jobs[jobs_idx[i]], paths[i], sizes[i], mtimes[i]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# the services are flat scripts importing each other by module name (run from services/)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,51 @@
+import pytest
+
+from classifier import CLASSIFIER, dir_part
+
+# path below the job folder -> resource_type (None: not indexed)
+CASES = [
+    ("Sales/Material Usages and Factory Handover/Job1001 MU.xlsx", "mu_sheet"),
+    ("sales/material usages and factory handover/Old/JOB1001 MU.XLSX", "mu_sheet"),
+    ("Sales/Material Usages and Factory Handover/MU copy.xlsx", None),  # no Job prefix
+    ("Design/Cut Files/Production/Job1001 cut 1.ai", "cut_file"),
+    ("Design/Cut Files/1 Off/Job1001 cut 1.ai", "cut_file"),
+    ("Design/Cut Files/Job1001 cut 1.ai", None),
+    ("Pics and Assembly/Job1001 assembly.pdf", "assembly_instructions"),
+    ("Pics and Assembly/IMG_0001.JPG", "pics"),
+    ("Pics and Assembly/Site/IMG_0002.jpeg", "pics"),
+    ("Design/Low Res/Production/Job1001 low res.pdf", "low_res"),
+    ("Design/Print Files/1 Off/Job1001 print.pdf", "print_files"),
+    ("Design/Set Up/Production/Job1001 set up.pdf", "set_up"),
+    ("Design/Technical Drawings/front.jpg", "technical_drawings"),
+    ("Design/Technical Drawings/model.3dm", "3d_file"),
+    ("Design/Working/draft 1.psd", None),
+    ("Job1001 MU.xlsx", None),
+    # folder names are whole components now; these matched as substrings of the path before
+    ("Presales/Material Usages and Factory Handover/Job1001 MU.xlsx", None),
+    ("Design/Cut Files/Production Old/Job1001 cut 1.ai", None),
+    ("Design/Cut Files Archive/Production/Job1001 cut 1.ai", None),
+    ("Design/Low Res/Pre-production/Job1001 low res.pdf", None),
+    ("Old Pics and Assembly/IMG_0001.jpg", None),
+]
+
+
+@pytest.mark.parametrize("rel_path, expected", CASES)
+def test_classify(rel_path, expected):
+    assert CLASSIFIER.classify(rel_path) == expected
+
+
+@pytest.mark.parametrize("rel_path, expected", CASES)
+def test_for_dir_match_agrees_with_classify(rel_path, expected):
+    # the crawler's path: rules resolved per directory, then one match per file
+    *folders, name = rel_path.split("/")
+    assert CLASSIFIER.match(CLASSIFIER.for_dir(tuple(dir_part(f) for f in folders)), name) == expected
+
+
+def test_windows_separators():
+    assert CLASSIFIER.classify("Design\\Cut Files\\Production\\Job1001 cut 1.ai") == "cut_file"
+
+
+def test_irrelevant_folders_share_a_table():
+    a = CLASSIFIER.for_dir(("design", "cut files", "production", "client a"))
+    b = CLASSIFIER.for_dir(("design", "cut files", "production", "client b", "v2"))
+    assert a is b
@@ -0,0 +1,44 @@
+import crawler
+from crawl_metrics import BATCH_BUCKETS, CrawlMetrics
+
+
+def _metrics(seconds):
+    m = CrawlMetrics()
+    for s in seconds:
+        m.add_batch(1000, s, "values")
+    m.finish()
+    return m
+
+
+def test_report_keeps_every_batch_and_quantiles():
+    m = _metrics([0.01 * i for i in range(1, 101)])  # 0.01 .. 1.00
+    db = m.report()["db_batches"]
+    assert db["count"] == 100 and len(db["batches"]) == 100
+    assert db["batches"][0] == {"rows": 1000, "seconds": 0.01, "mode": "values"}
+    assert db["p50_seconds"] == 0.51 and db["p90_seconds"] == 0.91 and db["p99_seconds"] == 1.0
+    assert db["buckets"]["0.1"] == 10 and db["buckets"]["1.0"] == 100
+
+
+def test_report_without_batches():
+    db = CrawlMetrics().report()["db_batches"]
+    assert db["count"] == 0 and db["p50_seconds"] is None and db["batches"] == []
+
+
+def test_prometheus_histogram():
+    text = _metrics([0.2, 0.7, 3.0]).prometheus()
+    assert "# TYPE crawler_db_batch_seconds histogram" in text
+    buckets = [line for line in text.splitlines() if line.startswith("crawler_db_batch_seconds_bucket")]
+    assert len(buckets) == len(BATCH_BUCKETS) + 1
+    assert 'crawler_db_batch_seconds_bucket{le="0.25"} 1' in buckets
+    assert 'crawler_db_batch_seconds_bucket{le="5.0"} 3' in buckets
+    assert buckets[-1] == 'crawler_db_batch_seconds_bucket{le="+Inf"} 3'
+    assert "crawler_db_batch_seconds_count 3" in text
+
+
+def test_unlistable_server_is_counted_and_skipped(tmp_path):
+    (tmp_path / "Job1001-Client").mkdir()
+    m = CrawlMetrics()
+    groups = crawler._job_groups([str(tmp_path / "missing"), str(tmp_path)], {}, 1, metrics=m)
+    assert [label for label, _, _ in groups] == [str(tmp_path)]
+    assert m.errors[("server", "FileNotFoundError")] == 1
+    assert 'crawler_errors_total{where="server",kind="FileNotFoundError"} 1' in m.prometheus()
@@ -0,0 +1,57 @@
+import os
+import time
+
+import crawler
+
+NOW = 1_800_000_000.0
+DAY = 86400
+
+
+def state(root_mtime_ns=1, max_mtime=NOW - DAY, last_scan=NOW - 60):
+    return {"job_name": "Job1001-Client", "root_mtime_ns": root_mtime_ns, "max_mtime": max_mtime,
+            "entry_count": 3, "last_scan": last_scan}
+
+
+def test_new_job_is_due():
+    assert crawler._job_due(None, 1, NOW)
+
+
+def test_changed_root_is_due():
+    assert crawler._job_due(state(root_mtime_ns=1), 2, NOW)
+
+
+def test_active_job_with_unchanged_root_is_still_walked():
+    # deep changes don't move the root's mtime, so recently worked-on jobs are always walked
+    assert crawler._job_due(state(max_mtime=NOW - DAY), 1, NOW)
+
+
+def test_idle_job_with_unchanged_root_is_skipped_until_recheck():
+    idle = NOW - crawler.JOB_IDLE_SECONDS - DAY
+    assert not crawler._job_due(state(max_mtime=idle, last_scan=NOW - 60), 1, NOW)
+    assert crawler._job_due(state(max_mtime=idle, last_scan=NOW - crawler.JOB_IDLE_RECHECK_SECONDS - 1), 1, NOW)
+
+
+def _touch(path, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    os.utime(path, (mtime, mtime))
+
+
+def test_deep_change_in_idle_job_waits_for_recheck(tmp_path):
+    job = tmp_path / "Job1001-Client"
+    old = time.time() - crawler.JOB_IDLE_SECONDS - 10 * DAY
+    pics = job / "Pics and Assembly"
+    _touch(pics / "IMG_0001.jpg", old)
+    rows, _, _, st = crawler._scan_job(job, job.name, "1001", manifest={})
+    assert len(rows) == 1
+
+    # a new file one level down: the job folder's own mtime doesn't move
+    root_ns = os.stat(job).st_mtime_ns
+    _touch(pics / "IMG_0002.jpg", time.time())
+    assert os.stat(job).st_mtime_ns == root_ns
+    rows, _, _, skipped = crawler._scan_job(job, job.name, "1001", job_state=st, manifest={})
+    assert rows == [] and skipped is None
+
+    st["last_scan"] -= crawler.JOB_IDLE_RECHECK_SECONDS + 1
+    rows, _, _, _ = crawler._scan_job(job, job.name, "1001", job_state=st, manifest={})
+    assert "IMG_0002.jpg" in [r["filename"] for r in rows]
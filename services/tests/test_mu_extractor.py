@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from mu_extractor import extract_board, extract_dims, parse_workbook
+from mu_synth import make_sheet
+
+
+def _boards(rows):
+    return [(r["XB Type"], r["Thickness (mm)"], r["Size"], r["Units Up"]) for r in rows]
+
+
+def test_extract_board_header_row():
+    # header two rows below the anchor, columns not where the template puts them
+    grid = {
+        6: {1: "BOARD REQUIRED"},
+        8: {2: "XB Type", 3: "Thickness", 4: "Sheet size", 6: "Qty"},
+        9: {2: "XB White", 3: "10mm", 4: "2440x1220", 6: 4, 8: "cut on Zund"},
+        10: {2: "XB Kraft", 3: 16, 4: "3050x1220", 6: 12},
+        12: {1: "HARDWARE"},
+        13: {2: "screws", 6: 100},
+    }
+    rows = extract_board("abc123", grid)
+    assert all(r["ID"] == "abc123" for r in rows)
+    assert _boards(rows) == [
+        ("XB White", "10", "2440x1220", 4),
+        ("XB Kraft", "16", "3050x1220", 12),
+    ]
+
+
+def test_extract_board_legacy_layout():
+    # no header row: data starts three rows below the anchor, columns anchor +0/+1/+2/+4
+    grid = {
+        10: {2: "Board required:"},
+        11: {2: "see drawing"},
+        13: {2: "XB Brown", 3: "22 mm", 4: "2440 x 1220", 5: "x", 6: 2},
+        14: {2: "XB Print", 3: "10", 4: "1830x1220", 6: 30},
+        15: {1: "note", 2: "ELECTRICAL"},
+    }
+    rows = extract_board("abc123", grid)
+    assert _boards(rows) == [
+        ("XB Brown", "22", "2440 x 1220", 2),
+        ("XB Print", "10", "1830x1220", 30),
+    ]
+
+
+@pytest.mark.parametrize("text, whd", [
+    ("1200w x 800h x 400d mm", (1200, 800, 400)),
+    ("1200 x 800 x 400mm", (1200, 800, 400)),
+    ("120cm x 80cm x 40cm", (1200, 800, 400)),
+    ("1.2m x 0.8m x 0.45m", (1200, 800, 450)),
+    ("120 x 80 x 40cm", (1200, 800, 400)),  # one trailing unit applies to every number
+    ("1,2 x 0,8 x 0,4 m", (1200, 800, 400)),
+    ("1200W 800H 400D", (1200, 800, 400)),  # no unit: mm
+    ("800h x 1200w x 400d", (1200, 800, 400)),
+    ("120 x 80 x 40cm max", (1200, 800, 400)),  # the m of "max" isn't a unit
+    ("600mm x 40cm x 1m", (600, 400, 1000)),  # mixed units, each number its own
+    ("1200 x 800", (1200, 800, None)),
+])
+def test_extract_dims(text, whd):
+    res = extract_dims("abc123", ["Job no:", 10001, "Dims", text, None])
+    assert (res["Width"], res["Height"], res["Depth"]) == whd
+    assert res["ID"] == "abc123"
+
+
+@pytest.mark.parametrize("vals", [["Job no:", 10001], ["Dims", None, None], ["Dims", "  ", None]])
+def test_extract_dims_missing(vals):
+    res = extract_dims("abc123", vals)
+    assert (res["Width"], res["Height"], res["Depth"]) == (0, 0, 0)
+
+
+def test_extract_board_without_anchor():
+    assert extract_board("abc123", {1: {1: "MATERIAL USAGE"}, 2: {1: "XB White"}}) == []
+
+
+@pytest.mark.parametrize("header", [True, False])
+def test_parse_workbook_boards(tmp_path, header):
+    path = tmp_path / "Job10001 MU.xlsx"
+    expected = make_sheet(path, 10001, random.Random(1), boards=6, header=header, padding_rows=50)
+    res = parse_workbook(str(path))
+    assert res["job"]["Job ID"] == expected["job_no"]
+    assert [list(b) for b in _boards(res["boards"])] == expected["boards"]
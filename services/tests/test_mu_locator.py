@@ -0,0 +1,42 @@
+import pytest
+
+from mu_locator import _in_mu_folder, upsert_scanned
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("X:/Job1001-Client/Sales/Material Usages and Factory Handover/Job1001 MU.xlsx", True),
+    ("X:\\Job1001-Client\\sales\\Material usages and Factory handover\\Job1001 MU.xlsx", True),
+    ("U:/XConverting3/Job1001-Client/Sales/Material Usages and Factory Handover/Job1001 MU.xlsx", True),
+    ("X:/Job1001-Client/Sales/Material Usages and Factory Handover/Old/Job1001 MU.xlsx", False),
+    ("X:/Job1001-Client/Design/Sales/Material Usages and Factory Handover/Job1001 MU.xlsx", False),
+    ("X:/Job1002-Other/Sales/Material Usages and Factory Handover/Job1001 MU.xlsx", False),
+])
+def test_in_mu_folder(path, expected):
+    assert _in_mu_folder(path, "Job1001-Client") is expected
+
+
+class _Cursor:
+    # records the statements upsert_locations sends
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, sql, params):
+        self.calls.append(params)
+
+    def fetchall(self):
+        return [(True,)] * len(self.calls[-1][0])
+
+
+def test_upsert_scanned_only_takes_sheets_in_the_mu_folder():
+    base = "X:/Job1001-Client/Sales/Material Usages and Factory Handover/"
+    rows = [
+        {"resource_type": "mu_sheet", "job_name": "Job1001-Client", "abs_path": base + "Job1001 MU.xlsx",
+         "size_bytes": 10, "mtime_epoch": 1},
+        {"resource_type": "mu_sheet", "job_name": "Job1001-Client", "abs_path": base + "Old/Job1001 MU.xlsx",
+         "size_bytes": 10, "mtime_epoch": 1},
+        {"resource_type": "pics", "job_name": "Job1001-Client", "abs_path": "X:/Job1001-Client/Pics and Assembly/a.jpg",
+         "size_bytes": 10, "mtime_epoch": 1},
+    ]
+    cur = _Cursor()
+    assert upsert_scanned(cur, rows) == 1
+    assert cur.calls[0][2] == [base + "Job1001 MU.xlsx"]
@@ -0,0 +1,134 @@
+import random
+import zipfile
+
+import openpyxl
+import pytest
+
+from mu_synth import make_sheet
+from xlsx_reader import read_sheet
+
+NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+R_NS = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+PKG_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+
+# hand-written sheet XML for what openpyxl never writes itself (inline strings, rich text runs,
+# a row element without cells, cells without r=)
+SHEET_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<worksheet {NS}>
+<dimension ref="A1:E6"/>
+<sheetData>
+<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="D1" t="inlineStr"><is><t>inline</t></is></c></row>
+<row r="2"><c r="A2"><v>42</v></c><c r="B2"><v>1.5</v></c><c r="C2"><v>1E3</v></c><c r="D2"><v>-7</v></c></row>
+<row r="3"/>
+<row r="5"><c r="A5" t="b"><v>1</v></c><c r="B5" t="b"><v>0</v></c><c r="C5" t="str"><f>A1</f><v>Dims</v></c><c r="E5" t="e"><v>#N/A</v></c></row>
+<row r="6"><c t="inlineStr"><is><r><t>rich </t></r><r><t>inline</t></r></is></c><c><v>3</v></c></row>
+</sheetData>
+</worksheet>"""
+
+SHARED_XML = f"""<?xml version="1.0" encoding="UTF-8"?>
+<sst {NS} count="2" uniqueCount="2">
+<si><t>BOARD REQUIRED</t></si>
+<si><r><t>XB </t></r><r><t>White</t></r></si>
+</sst>"""
+
+
+def _write_xlsx(path, sheet_xml, shared_xml):
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/worksheets/sheet1.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            '<Override PartName="/xl/sharedStrings.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+            '</Types>'),
+        "_rels/.rels": (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships {PKG_NS}>'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'),
+        "xl/workbook.xml": (
+            f'<?xml version="1.0" encoding="UTF-8"?><workbook {NS} {R_NS}>'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>'),
+        "xl/_rels/workbook.xml.rels": (
+            f'<?xml version="1.0" encoding="UTF-8"?><Relationships {PKG_NS}>'
+            f'<Relationship Id="rId1" Type="{REL_TYPE}worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{REL_TYPE}sharedStrings" Target="sharedStrings.xml"/>'
+            '</Relationships>'),
+        "xl/worksheets/sheet1.xml": sheet_xml,
+        "xl/sharedStrings.xml": shared_xml,
+    }
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _openpyxl_rows(path):
+    wb = openpyxl.load_workbook(path, data_only=True, read_only=True)
+    try:
+        return list(wb["Sheet1"].iter_rows(values_only=True))
+    finally:
+        wb.close()
+
+
+@pytest.fixture
+def handmade(tmp_path):
+    return _write_xlsx(tmp_path / "handmade.xlsx", SHEET_XML, SHARED_XML)
+
+
+def test_values_match_openpyxl(handmade):
+    sheet = read_sheet(handmade)
+    assert list(sheet.rows()) == _openpyxl_rows(handmade)
+    assert sheet.dims == (1, 1, 5, 6)
+    assert not sheet.stopped
+
+
+def test_value_types(handmade):
+    cells = read_sheet(handmade).cells
+    assert cells[(1, 1)] == "BOARD REQUIRED"  # shared string
+    assert cells[(1, 2)] == "XB White"  # shared string, rich text runs
+    assert cells[(1, 4)] == "inline"
+    assert cells[(6, 1)] == "rich inline"
+    assert [cells[(2, c)] for c in range(1, 5)] == [42, 1.5, 1000.0, -7]
+    assert type(cells[(2, 1)]) is int and type(cells[(2, 3)]) is float
+    assert cells[(5, 1)] is True and cells[(5, 2)] is False
+    assert cells[(5, 3)] == "Dims"  # cached formula result
+    assert cells[(5, 5)] == "#N/A"
+    assert cells[(6, 2)] == 3  # no r=: columns counted on from the previous cell
+
+
+def test_empty_rows(handmade):
+    sheet = read_sheet(handmade)
+    rows = list(sheet.rows())
+    # row 3 is an element without cells, row 4 isn't in the XML at all: both come out padded
+    assert rows[2] == rows[3] == (None,) * 5
+    assert 3 not in sheet.by_row() and 4 not in sheet.by_row()
+    assert len(sheet.flat()) == 6 * 5
+
+
+def test_stop_ends_the_read(handmade):
+    seen = []
+
+    def stop(row, vals):
+        seen.append((row, vals))
+        return row == 2
+
+    sheet = read_sheet(handmade, stop=stop)
+    assert sheet.stopped
+    assert [r for r, _ in seen] == [1, 2]
+    assert seen[1][1] == {1: 42, 2: 1.5, 3: 1000.0, 4: -7}
+    assert max(r for r, _ in sheet.cells) == 2
+    assert list(sheet.rows()) == _openpyxl_rows(handmade)[:2]
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_synthetic_sheet_matches_openpyxl(tmp_path, seed):
+    path = tmp_path / "mu.xlsx"
+    make_sheet(path, 10001 + seed, random.Random(seed), boards=5, padding_rows=30)
+    sheet = read_sheet(path, "Sheet1")
+    assert list(sheet.rows()) == _openpyxl_rows(path)
@@ -0,0 +1,292 @@
+import posixpath
+import re
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+# Minimal streaming reader for the cell values of one .xlsx worksheet (what mu_extractor needs),
+# without building openpyxl's workbook/cell objects. Values match openpyxl's
+# load_workbook(data_only=True, read_only=True): cached formula results, shared/inline strings,
+# bools, error strings, and numbers as int/float (datetime when the cell's style is a date format).
+MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ROW, _C, _V, _T, _R, _IS = (MAIN + t for t in ("row", "c", "v", "t", "r", "is"))
+_DIMENSION, _SHEETDATA = MAIN + "dimension", MAIN + "sheetData"
+_COORD = re.compile(r"\$?([A-Za-z]{1,3})?\$?(\d+)?")
+
+# builtin number formats (ECMA-376 18.8.30) that are dates / durations
+BUILTIN_DATE_FORMATS = {14, 15, 16, 17, 18, 19, 20, 21, 22, 45, 46, 47}
+BUILTIN_TIMEDELTA_FORMATS = {46}
+# same rules as openpyxl.styles.numbers.is_date_format / is_timedelta_format
+_FMT_STRIP = re.compile(r'".*?"|\[(?!hh?\]|mm?\]|ss?\])[^\]]*\]')
+_FMT_DATE = re.compile(r"(?<![_\\])[dmhysDMHYS]")
+_FMT_TIMEDELTA = re.compile(r"\[hh?\](:mm(:ss(\.0*)?)?)?|\[mm?\](:ss(\.0*)?)?|\[ss?\](\.0*)?", re.I)
+
+
+def _col_index(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + ord(ch) - 64
+    return n
+
+
+def _coord(ref: str):
+    # "B12" -> (12, 2); either part may be missing ("B", "12")
+    m = _COORD.fullmatch(ref or "")
+    if not m:
+        raise ValueError(f"{ref!r} is not a cell reference")
+    col, row = m.groups()
+    return (int(row) if row else None), (_col_index(col) if col else None)
+
+
+def _text(el) -> str:
+    # <si>/<is>: plain <t> plus rich-text runs <r><t>, phonetic runs (<rPh>) ignored
+    parts = []
+    t = el.find(_T)
+    if t is not None and t.text:
+        parts.append(t.text)
+    for r in el.iter(_R):
+        t = r.find(_T)
+        if t is not None and t.text:
+            parts.append(t.text)
+    return "".join(parts)
+
+
+class SheetCells:
+    """
+    Values of one worksheet: `cells` is a sparse {(row, col): value} map of the non-empty cells
+    (1-based); `dims` is (min_col, min_row, max_col, max_row) from the sheet's <dimension>, or None.
+    `stopped` is True when reading ended early (see read_sheet's stop).
+    """
+
+    def __init__(self, dims):
+        self.dims = dims
+        self.cells = {}
+        self.stopped = False
+        self._rows = []  # row numbers in document order, including rows without values
+
+    def by_row(self) -> dict:
+        """{row: {col: value}} of the non-empty cells."""
+        by_row = {}
+        for (r, c), v in self.cells.items():
+            by_row.setdefault(r, {})[c] = v
+        return by_row
+
+    def rows(self):
+        """Rows as openpyxl's ws.iter_rows(values_only=True) yields them (A1-anchored, padded)."""
+        max_col = max_row = None
+        if self.dims:
+            _, _, max_col, max_row = self.dims
+        by_row = self.by_row()
+        empty = (None,) * max_col if max_col else ()
+        counter = 1
+        for idx in self._rows:
+            if max_row is not None and idx > max_row:
+                break
+            while counter < idx:
+                counter += 1
+                yield empty
+            if counter <= idx:
+                counter += 1
+                vals = by_row.get(idx, {})
+                width = max_col or max(vals, default=0)
+                yield tuple(vals.get(c) for c in range(1, width + 1))
+
+    def flat(self) -> list:
+        """Every value row after row, the flattened list the MU extractors search."""
+        vals = []
+        for row in self.rows():
+            vals.extend(row)
+        return vals
+
+
+class XlsxReader:
+    """
+    Opens the zip once and resolves the workbook parts (sheets, shared strings, date styles);
+    read_sheet() then streams one worksheet. Use as a context manager.
+    """
+
+    def __init__(self, path):
+        self.zf = zipfile.ZipFile(path)
+        try:
+            self._load_workbook()
+        except BaseException:
+            self.zf.close()
+            raise
+
+    def close(self):
+        self.zf.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _rels(self, part: str) -> dict:
+        # {rId: (type suffix, absolute part name)} of a part's relationships
+        folder, name = posixpath.split(part)
+        rels_part = posixpath.join(folder, "_rels", name + ".rels")
+        out = {}
+        if rels_part not in self.zf.NameToInfo:
+            return out
+        with self.zf.open(rels_part) as f:
+            for _, el in iterparse(f):
+                if el.tag == PKG_REL + "Relationship":
+                    target = el.get("Target", "")
+                    if target.startswith("/"):
+                        target = target[1:]
+                    else:
+                        target = posixpath.normpath(posixpath.join(folder, target))
+                    out[el.get("Id")] = (el.get("Type", "").rsplit("/", 1)[-1], target)
+        return out
+
+    def _load_workbook(self):
+        book = next((t for typ, t in self._rels("").values() if typ == "officeDocument"), "xl/workbook.xml")
+        rels = self._rels(book)
+        self.sheets = []  # [(name, part)] in workbook order
+        self.active = 0
+        self.date1904 = False
+        with self.zf.open(book) as f:
+            for _, el in iterparse(f):
+                if el.tag == MAIN + "sheet":
+                    rel = rels.get(el.get(REL + "id"))
+                    if rel:
+                        self.sheets.append((el.get("name"), rel[1]))
+                elif el.tag == MAIN + "workbookView":
+                    self.active = int(el.get("activeTab", 0))
+                elif el.tag == MAIN + "workbookPr":
+                    self.date1904 = el.get("date1904") in ("1", "true")
+        self.sheetnames = [n for n, _ in self.sheets]
+
+        parts = {typ: t for typ, t in rels.values()}
+        self.shared_strings = []
+        if parts.get("sharedStrings") in self.zf.NameToInfo:
+            with self.zf.open(parts["sharedStrings"]) as f:
+                for _, el in iterparse(f):
+                    if el.tag == MAIN + "si":
+                        self.shared_strings.append(_text(el).replace("x005F_", ""))
+                        el.clear()
+
+        self.date_styles, self.timedelta_styles = set(), set()
+        if parts.get("styles") in self.zf.NameToInfo:
+            self._load_date_styles(parts["styles"])
+
+    def _load_date_styles(self, part):
+        # cellXfs index -> is its number format a date/duration; cells point at it with s="n"
+        custom, xfs, in_cell_xfs = {}, [], False
+        with self.zf.open(part) as f:
+            for ev, el in iterparse(f, events=("start", "end")):
+                if el.tag == MAIN + "cellXfs":
+                    in_cell_xfs = ev == "start"
+                elif ev == "end" and el.tag == MAIN + "numFmt":
+                    custom[int(el.get("numFmtId"))] = el.get("formatCode", "")
+                elif ev == "end" and el.tag == MAIN + "xf" and in_cell_xfs:
+                    xfs.append(int(el.get("numFmtId", 0)))
+        for idx, fmt_id in enumerate(xfs):
+            if fmt_id in custom:
+                code = custom[fmt_id].split(";")[0]
+                if _FMT_DATE.search(_FMT_STRIP.sub("", code)):
+                    self.date_styles.add(idx)
+                if _FMT_TIMEDELTA.search(code):
+                    self.timedelta_styles.add(idx)
+            else:
+                if fmt_id in BUILTIN_DATE_FORMATS:
+                    self.date_styles.add(idx)
+                if fmt_id in BUILTIN_TIMEDELTA_FORMATS:
+                    self.timedelta_styles.add(idx)
+
+    def sheet_part(self, name=None) -> str:
+        # named sheet, else the active one (like wb[name] if name in wb.sheetnames else wb.active)
+        for n, part in self.sheets:
+            if n == name:
+                return part
+        if not self.sheets:
+            raise ValueError("workbook has no sheets")
+        return self.sheets[min(self.active, len(self.sheets) - 1)][1]
+
+    def _number(self, text, style):
+        value = float(text) if ("." in text or "E" in text or "e" in text) else int(text)
+        if style in self.date_styles:
+            # rare in MU sheets, so openpyxl's date helpers are only pulled in when needed
+            from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+            try:
+                return from_excel(value, CALENDAR_MAC_1904 if self.date1904 else CALENDAR_WINDOWS_1900,
+                                  timedelta=style in self.timedelta_styles)
+            except (OverflowError, ValueError):
+                return "#VALUE!"
+        return value
+
+    def read_sheet(self, name=None, stop=None) -> SheetCells:
+        """
+        Stream one worksheet into a SheetCells.
+        stop(row, {col: value}) is called after every row with its non-empty values; returning
+        True ends the read there (the rest of the sheet XML is never parsed).
+        """
+        strings = self.shared_strings
+        with self.zf.open(self.sheet_part(name)) as f:
+            it = iterparse(f, events=("start", "end"))
+            sheet = None
+            row_counter, col_counter, row_vals = 0, 0, {}
+            for ev, el in it:
+                tag = el.tag
+                if ev == "start":
+                    if tag == _ROW:
+                        r = el.get("r")
+                        row_counter = int(r) if r else row_counter + 1
+                        col_counter, row_vals = 0, {}
+                    elif tag == _SHEETDATA and sheet is None:
+                        sheet = SheetCells(None)  # no <dimension> before the data
+                    continue
+
+                if tag == _C:
+                    ref = el.get("r")
+                    if ref:
+                        col_counter = _coord(ref)[1]
+                    else:
+                        col_counter += 1
+                    t = el.get("t", "n")
+                    value = None
+                    if t == "inlineStr":
+                        is_ = el.find(_IS)
+                        if is_ is not None:
+                            value = _text(is_)
+                    else:
+                        text = el.findtext(_V) or None
+                        if text is not None:
+                            if t == "n":
+                                s = el.get("s")
+                                value = self._number(text, int(s) if s else 0)
+                            elif t == "s":
+                                value = strings[int(text)]
+                            elif t == "b":
+                                value = bool(int(text))
+                            elif t == "d":
+                                from openpyxl.utils.datetime import from_ISO8601
+                                value = from_ISO8601(text)
+                            else:  # str (formula string), e (error)
+                                value = text
+                    if value is not None:
+                        row_vals[col_counter] = value
+                        sheet.cells[(row_counter, col_counter)] = value
+                    el.clear()
+                elif tag == _ROW:
+                    sheet._rows.append(row_counter)
+                    el.clear()
+                    if stop is not None and stop(row_counter, row_vals):
+                        sheet.stopped = True
+                        break
+                elif tag == _DIMENSION:
+                    ref = el.get("ref", "")
+                    lo, _, hi = ref.partition(":")
+                    min_row, min_col = _coord(lo)
+                    max_row, max_col = _coord(hi) if hi else (min_row, min_col)
+                    sheet = SheetCells((min_col, min_row, max_col, max_row))
+        return sheet if sheet is not None else SheetCells(None)
+
+
+def read_sheet(path, name=None, stop=None) -> SheetCells:
+    """Open `path`, read sheet `name` (or the active sheet if there's none by that name)."""
+    with XlsxReader(path) as book:
+        return book.read_sheet(name, stop)